@@ -1,7 +1,18 @@
 """ This module contains the filoc default backend implementations """
+import sys
+
 from .backend_csv import CsvBackend
 from .backend_json import JsonBackend
 from .backend_path import PathBackend
 from .backend_pickle import PickleBackend
 from .backend_yaml import YamlBackend
-from .backend_parquet import ParquetBackend
\ No newline at end of file
+
+# The parquet backend is imported on first access (PEP 562), as importing pandas is costly and not required by the other backends
+if sys.version_info < (3, 7):
+    from .backend_parquet import ParquetBackend
+else:
+    def __getattr__(name):
+        if name == 'ParquetBackend':
+            from .backend_parquet import ParquetBackend
+            return ParquetBackend
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,19 @@
+""" This module contains the filoc default cache serializer implementations """
+import sys
+
+from .cache_serializer_pickle import PickleCacheSerializer
+
+__all__     = [
+    'PickleCacheSerializer',
+    'MsgpackCacheSerializer',
+]
+
+# The msgpack cache serializer is imported on first access (PEP 562), as msgpack is an optional dependency not required by the default serializer
+if sys.version_info < (3, 7):
+    from .cache_serializer_msgpack import MsgpackCacheSerializer
+else:
+    def __getattr__(name):
+        if name == 'MsgpackCacheSerializer':
+            from .cache_serializer_msgpack import MsgpackCacheSerializer
+            return MsgpackCacheSerializer
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,118 @@
+""" Filoc msgpack cache serializer implementation """
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, BinaryIO, Dict, Hashable, Tuple
+
+from filoc.contract import CacheSerializerContract, ReadOnlyProps
+
+# msgpack is an optional dependency of filoc
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+log = logging.getLogger('filoc')
+
+# msgpack extension types of the values msgpack does not support natively
+_EXT_NAIVE_DATETIME = 1  # timezone naive datetime (ex: parsed from a `{date:%Y-%m-%d}` placeholder), as iso string
+_EXT_TUPLE          = 2  # tuple, as packed list (msgpack lists are unpacked as lists)
+_EXT_DATE           = 3  # date, as iso string
+_EXT_DECIMAL        = 4  # decimal, as string (exact)
+
+
+def _hash_path_props_items(path_props_items : Tuple[Tuple[str, Any], ...]) -> str:
+    path_props_json = json.dumps(dict(path_props_items), default=str)
+    return blake2b(path_props_json.encode(), digest_size=16).hexdigest()
+
+
+def _hash_typed_path_props_items(typed_path_props_items : Tuple[Tuple[str, type, Any], ...]) -> str:
+    return _hash_path_props_items(tuple((k, v) for k, _, v in typed_path_props_items))
+
+
+# the same files are listed on each read: their keys are computed once. The memo is keyed by the value types too,
+# because equal values of different types (ex: 1, 1.0 and True) are hashed differently
+_hash_typed_path_props_items_cached = lru_cache(maxsize=65536)(_hash_typed_path_props_items)
+
+
+def _pack(obj : Any) -> bytes:
+    # strict types: tuples and subclasses of the native types are passed to `_default`, instead of being silently converted
+    return msgpack.packb(obj, default=_default, datetime=True, use_bin_type=True, strict_types=True)
+
+
+def _unpack(data : bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, timestamp=3, ext_hook=_ext_hook, strict_map_key=False)
+
+
+def _default(obj : Any) -> Any:
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            return msgpack.ExtType(_EXT_NAIVE_DATETIME, obj.isoformat().encode())
+        if type(obj) is not datetime:
+            return datetime.combine(obj.date(), obj.timetz())  # ex: pandas Timestamp
+    elif isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    elif isinstance(obj, tuple):
+        return msgpack.ExtType(_EXT_TUPLE, _pack(list(obj)))
+    elif isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    elif type(obj).__module__ == 'numpy' and hasattr(obj, 'item'):
+        return obj.item()  # numpy scalar (ex: numpy.int64 read by the pandas frontend), as the equivalent python value
+    for native_type in (bool, int, float, str, bytes, dict, list):
+        if isinstance(obj, native_type):
+            return native_type(obj)
+    raise TypeError(f'Cannot serialize {type(obj)} object into msgpack cache')
+
+
+def _ext_hook(code : int, data : bytes) -> Any:
+    if code == _EXT_NAIVE_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_TUPLE:
+        return tuple(_unpack(data))
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCacheSerializer(CacheSerializerContract):
+    """
+    filoc cache serializer saving the cache files with msgpack, which (de)serializes faster and produces smaller files than pickle. This implementation
+    is used when you call the filoc factory with the ``cache_serializer`` argument set to ``'msgpack'``. It requires the ``msgpack`` package.
+
+    The cache entries are keyed by a stable hash of the path props, so that the keys are plain strings. Supported values are ``None``, ``bool``, ``int``,
+    ``float``, ``str``, ``bytes``, ``list``, ``dict`` and subclasses, ``datetime``, ``date``, ``Decimal``, tuples and numpy scalars (loaded as the equivalent
+    python value). Other values raise a ``TypeError`` when the cache is saved: use the ``'pickle'`` serializer for them. A cache file that cannot be
+    decoded (ex: written by another serializer) is loaded as an empty cache.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        if msgpack is None:
+            raise ImportError("The msgpack cache serializer requires the msgpack package: pip install msgpack")
+
+    def key(self, path_props : ReadOnlyProps) -> Hashable:
+        """(see CacheSerializerContract contract)"""
+        path_props_items = tuple(sorted(path_props.items()))
+        try:
+            return _hash_typed_path_props_items_cached(tuple((k, type(v), v) for k, v in path_props_items))
+        except TypeError:
+            # unhashable path prop value: no memoization
+            return _hash_path_props_items(path_props_items)
+
+    def load(self, f : BinaryIO) -> Dict[Hashable, Dict[str, Any]]:
+        """(see CacheSerializerContract contract)"""
+        data = f.read()
+        try:
+            return _unpack(data)
+        except (ValueError, msgpack.UnpackException) as e:
+            log.warning('Cache file %s cannot be decoded (%s). It is considered empty', getattr(f, 'path', f), e)
+            return dict()
+
+    def dump(self, cache : Dict[Hashable, Dict[str, Any]], f : BinaryIO) -> None:
+        """(see CacheSerializerContract contract)"""
+        f.write(_pack(cache))
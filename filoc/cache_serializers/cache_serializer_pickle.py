@@ -0,0 +1,27 @@
+""" Filoc default pickle cache serializer implementation """
+import pickle
+from typing import Any, BinaryIO, Dict, Hashable
+
+from frozendict import frozendict
+
+from filoc.contract import CacheSerializerContract, ReadOnlyProps
+
+
+class PickleCacheSerializer(CacheSerializerContract):
+    """
+    filoc cache serializer saving the cache files with pickle. It is the default cache serializer, used when you call the filoc factory with the
+    ``cache_serializer`` argument set to ``'pickle'``. The cache entries are keyed by the frozen path props.
+    """
+
+    def key(self, path_props : ReadOnlyProps) -> Hashable:
+        """(see CacheSerializerContract contract)"""
+        return path_props if isinstance(path_props, frozendict) else frozendict(path_props)
+
+    def load(self, f : BinaryIO) -> Dict[Hashable, Dict[str, Any]]:
+        """(see CacheSerializerContract contract)"""
+        # single contiguous read: pickle.load() would issue many small reads on the (possibly remote) fsspec file
+        return pickle.loads(f.read())
+
+    def dump(self, cache : Dict[Hashable, Dict[str, Any]], f : BinaryIO) -> None:
+        """(see CacheSerializerContract contract)"""
+        f.write(pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL))
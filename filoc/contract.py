@@ -8,7 +8,7 @@ custom frontends and backends need to implement.
 # -------------
 import logging
 from abc import ABC, abstractmethod
-from typing import TypeVar, Any, List, Generic, Optional, Mapping, Dict, Collection, Union
+from typing import TypeVar, Any, List, Generic, Optional, Mapping, Dict, Collection, Union, Hashable, BinaryIO
 from fsspec import AbstractFileSystem
 
 # Literal is python 3.8 feature, but filoc works from python 3.6 upward
@@ -34,6 +34,9 @@ BuiltinFrontends      = Literal['json', 'pandas'] if Literal else str
 BuiltinBackends       = Literal['path', 'json', 'yaml', 'csv', 'pickle', 'parquet'] if Literal else str
 """Shortcut used to designate filoc preset backends: 'meta' is a special backend that does not read the file contents but only the file metadata"""
 
+BuiltinCacheSerializers = Literal['pickle', 'msgpack'] if Literal else str
+"""Shortcuts used to designate filoc preset cache serializers"""
+
 MetaOptions           = Union[None, bool, str, List[str], Mapping[str, str]]
 """Options to pass to the `meta` parameters. Determine which file metadata to add as property: None: None, True: all, False: none, str or list of str: explicit list of metadata, Mapping: explicit mapping of metadata (used to renamed metadata at once)"""
 
@@ -115,6 +118,45 @@ class BackendContract(ABC):
         raise NotImplementedError("Abstract")
 
 
+class CacheSerializerContract(ABC):
+    """The abstract class that filoc cache serializers need to implement. A cache serializer determines how the cache files
+    defined by ``cache_locpath`` are saved and loaded, and which keys identify the cache entries inside a cache file."""
+
+    @abstractmethod
+    def key(self, path_props : ReadOnlyProps) -> Hashable:
+        """Converts the path props of a file into the key of its cache entry.
+
+        Args:
+            path_props: the key-values extracted from the path of the cached file
+
+        Returns:
+            A hashable key, that the serializer is able to save and load.
+        """
+        raise NotImplementedError("Abstract")
+
+    @abstractmethod
+    def load(self, f : BinaryIO) -> Dict[Hashable, Dict[str, Any]]:
+        """Loads the cache entries from the cache file ``f`` opened in binary read mode.
+
+        Args:
+            f: The cache file
+
+        Returns:
+            The cache entries by key
+        """
+        raise NotImplementedError("Abstract")
+
+    @abstractmethod
+    def dump(self, cache : Dict[Hashable, Dict[str, Any]], f : BinaryIO) -> None:
+        """Saves the cache entries ``cache`` into the cache file ``f`` opened in binary write mode.
+
+        Args:
+            cache: The cache entries by key
+            f: The cache file
+        """
+        raise NotImplementedError("Abstract")
+
+
 class FrontendContract(Generic[TContent, TContents], ABC):
     """The abstract class that filoc frontends need to implement.
 
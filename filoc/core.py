@@ -3,27 +3,48 @@ import json
 import logging
 import os
 import sys
-import pickle
 import random
 import socket
 import threading
 import time
+import uuid
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from io import UnsupportedOperation
-from typing import Dict, Any, NamedTuple, Optional, Tuple, Set
+from itertools import groupby
+from typing import Dict, Any, Callable, Hashable, Iterable, List, NamedTuple, Optional, Tuple, Set, FrozenSet
 
-from frozendict import frozendict
+from fsspec.implementations.local import LocalFileSystem
 from fsspec.spec import AbstractFileSystem
 
 from filoc.contract import TContent, TContents, Constraints, Props, PropsList, Filoc, \
-    FrontendContract, BackendContract, ReadOnlyProps, Constraint, ReadOnlyPropsList, MetaOptions, ConfigurationError
+    FrontendContract, BackendContract, ReadOnlyProps, Constraint, ReadOnlyPropsList, MetaOptions, ConfigurationError, CacheSerializerContract
+from .cache_serializers.cache_serializer_pickle import PickleCacheSerializer
 from .filoc_io import FilocIO, mix_dicts_and_coerce, get_meta_mapping
 from .utils import merge_tables
 
 log = logging.getLogger('filoc')
 
+# the host name does not change during the life of the process
+_hostname = socket.gethostname()
+_missing  = object()  # sentinel for missing props
+_lock_id_local = threading.local()
+
+# kinds of props, when splitting the props to write
+_PATH_PROP = 0
+_META_PROP = 1
+
+
+def _get_my_lock_id() -> str:
+    # scope of lock is (process x thread): computed once per thread, and again in a forked child process
+    pid = os.getpid()
+    if getattr(_lock_id_local, 'pid', None) != pid:
+        _lock_id_local.pid     = pid
+        _lock_id_local.lock_id = f'{_hostname}_{pid}_{threading.get_ident()}'
+    return _lock_id_local.lock_id
+
 
 class LockException(Exception):
     """ Exception raised while trying to acquire a lock with ``Filoc.lock()`` after the count of defined attempts has been reached"""
@@ -33,7 +54,23 @@ class LockException(Exception):
 
 class _RunningCache(NamedTuple):
     path : str  # cache file path
-    cache_by_file_path_props : Dict[ReadOnlyProps, Dict[str, Any]]  # key-values expected by (this) locpath props
+    cache_by_file_path_props : Dict[Hashable, Dict[str, Any]]  # key-values expected by (this) locpath props, keyed by cache serializer key
+    exists : bool  # whether the cache file was loaded from the file system, i.e. its folder already exists
+
+
+def _get_entry_modified(fs: AbstractFileSystem, entry: Dict[str, Any]) -> Optional[datetime]:
+    """ Extracts the modification date from an fsspec ``ls(..., detail=True)`` entry. Falls back to ``fs.modified()`` if the entry does not contain it """
+    mtime = entry.get('mtime', None)
+    if mtime is None:
+        mtime = entry.get('LastModified', None)
+    if isinstance(mtime, datetime):
+        return mtime
+    if isinstance(mtime, (int, float)):
+        return datetime.fromtimestamp(mtime, tz=timezone.utc)
+    try:
+        return fs.modified(entry['name'])
+    except FileNotFoundError:
+        return None
 
 
 # TODO: Profile and apply intern(key) to reduce footprint of intermediate model dictionaries
@@ -59,11 +96,13 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
             cache_version_prop : Optional[str]                        ,
             meta               : MetaOptions                          ,
             fs                 : Optional[AbstractFileSystem]         ,
+            max_read_workers   : int                                  = 1,
+            cache_serializer   : Optional[CacheSerializerContract]    = None,
     ):
         """
         if cache_locpath is relative, then it will be relative to result_locpath
         """
-        FilocIO.__init__(self, locpath, writable, fs)
+        FilocIO.__init__(self, locpath, writable, fs, max_list_workers=max_read_workers)
         self._transaction   = transaction
         self._frontend      = frontend
         self._backend       = backend
@@ -74,11 +113,19 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
             self._cache_loc = FilocIO(cache_locpath, writable=True, fs=cache_fs)
 
         self._cache_version_prop = cache_version_prop
+        self._cache_serializer   = cache_serializer if cache_serializer is not None else PickleCacheSerializer()
+        self._max_read_workers   = max_read_workers
         self._meta = meta
         self._meta_mapping = get_meta_mapping(meta)
         if writable and self._meta is not None and self._meta_mapping is None:
             raise ConfigurationError('writable=True and meta=True are incompatible. Either set writable=False OR name explicit meta property name/names or mapping')
 
+        # props to write are split by a single lookup in this table: prop name -> _PATH_PROP or _META_PROP (path props win)
+        self._prop_kind_by_name = {}  # type: Dict[str, int]
+        if self._meta is not None and self._meta_mapping is not None:
+            self._prop_kind_by_name.update((k, _META_PROP) for k in self._meta_mapping)
+        self._prop_kind_by_name.update((k, _PATH_PROP) for k in self._path_props)
+
     @contextmanager
     def lock(self, attempt_count: int = 60, attempt_secs: float = 1.0):
         """ See ``Filoc`` contract """
@@ -88,7 +135,11 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
         # file system sets timestamps in the same order as it processes the files (TODO: Verify assumption on distributed file systems)
 
         lock_id, lock_file = self._get_my_lock_id_and_lock_file()
-        for attempt in range(attempt_count):
+        lock_info_bytes = self._get_my_lock_info_bytes()
+        sleep, uniform = time.sleep, random.uniform
+        min_wait_secs, max_wait_secs = 0.5 * attempt_secs, 1.5 * attempt_secs
+        root_folder_created = False  # the root folder is created once, on the first attempt to write the lock file
+        for _ in range(attempt_count):
             owning_lock_date_and_file = self._get_owning_lock_date_and_file()
 
             if owning_lock_date_and_file:
@@ -96,31 +147,41 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
                     yield lock_id
                     return
                 else:
-                    time.sleep(random.uniform(0.5 * attempt_secs, 1.5 * attempt_secs))
+                    sleep(uniform(min_wait_secs, max_wait_secs))
                     continue
 
             # else we try to acquire the lock
-            self.fs.makedirs(self._root_folder, exist_ok=True)
-            with self.fs.open(lock_file, 'w') as f:
-                json.dump({
-                    'host' : socket.gethostname(),
-                    'pid' : os.getpid(),
-                    'thread' : threading.get_ident(),
-                }, f)
+            if not root_folder_created:
+                self.fs.makedirs(self._root_folder, exist_ok=True)
+                root_folder_created = True
+            with self.fs.open(lock_file, 'wb') as f:
+                f.write(lock_info_bytes)
 
+            delete_on_exit = True
             try:
                 owning_lock_date_and_file = self._get_owning_lock_date_and_file()
-                if owning_lock_date_and_file and owning_lock_date_and_file[1].endswith(lock_id):
+                if owning_lock_date_and_file is None:
+                    # our lock file has been concurrently deleted (by self.lock_force_release()?). Nothing to clean up
+                    delete_on_exit = False
+                    continue
+                if owning_lock_date_and_file[1].endswith(lock_id):
                     yield lock_id
                     return
+                # a concurrent won the race: clean up and retry (loop). The deletion is synchronous, so that our lock file
+                # cannot be (wrongly) seen as the oldest one at the next ownership check, once the winner has released the lock
             finally:
-                # else either failed to acquire lock (concurrent won) or some error. We clean up and retry (loop)
-                try:
-                    self.fs.delete(lock_file)
-                except FileNotFoundError:
-                    log.warning(f"Lock file {lock_file} has been concurrently deleted (by self.lock_force_release()?). No need to remove it")        
+                # lock released, race lost or some error. We clean up synchronously
+                if delete_on_exit:
+                    self._delete_lock_file(lock_file)
+
         raise LockException(f"Failed to acquire the file lock after {attempt_count} attempts")
 
+    def _delete_lock_file(self, lock_file: str):
+        try:
+            self.fs.delete(lock_file)
+        except FileNotFoundError:
+            log.warning("Lock file %s has been concurrently deleted (by self.lock_force_release()?). No need to remove it", lock_file)
+
     def lock_info(self) -> Optional[Dict[str, Any]]:
         """ See ``Filoc`` contract """
         owning_lock_date_and_file = self._get_owning_lock_date_and_file()
@@ -139,44 +200,59 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
         """ See ``Filoc`` contract """
         owning_lock_date_and_file = self._get_owning_lock_date_and_file()
         if owning_lock_date_and_file is None:
-            log.info(f'No lock found')
+            log.info('No lock found')
             return
 
         lock_file = owning_lock_date_and_file[1]
         try:
             self.fs.delete(lock_file)
-            log.warning(f'Forced releasing of lock file "{lock_file}"')
+            log.warning('Forced releasing of lock file "%s"', lock_file)
         except FileNotFoundError:
             return
 
     def _get_owning_lock_date_and_file(self) -> Optional[Tuple[datetime, str]]:
-        lock_files = self.fs.glob(f'{self._root_folder}/.lock_*')
-        if len(lock_files) == 0:
+        # single listing of the root folder: names and timestamps are fetched in one round trip
+        try:
+            entries = self.fs.ls(self._root_folder, detail=True)
+        except FileNotFoundError:
             return None
-        
+
+        lock_entries = [e for e in entries if e['name'].rsplit(self.fs.sep, 1)[-1].startswith('.lock_')]
+        if len(lock_entries) == 0:
+            return None
+        if len(lock_entries) == 1:
+            lock_file = lock_entries[0]['name']
+            date = _get_entry_modified(self.fs, lock_entries[0])
+            return (date, lock_file) if date is not None else None
+
         oldest_date = None
         oldest_file = None
-        for lock_file in lock_files:
-            try: 
-                date = self.fs.modified(lock_file)
-            except FileNotFoundError: 
+        for lock_entry in lock_entries:
+            date = _get_entry_modified(self.fs, lock_entry)
+            if date is None:
                 continue
             if oldest_date is None or date < oldest_date:
                 oldest_date = date
-                oldest_file = lock_file
+                oldest_file = lock_entry['name']
         if oldest_file is None:
             return None
         return oldest_date, oldest_file
 
     def _get_my_lock_id_and_lock_file(self):
-        # build a lock id. Scope of lock is (process x thread x root_folder)
-        host      = socket.gethostname()
-        pid       = os.getpid()
-        thread_id = threading.get_ident()
-        lock_id   = f'{host}_{pid}_{thread_id}'
-        lock_file = f'{self._root_folder}/.lock_{lock_id}'
+        # scope of lock is (process x thread x root_folder)
+        lock_id   = _get_my_lock_id()
+        lock_file = self._root_folder + '/.lock_' + lock_id
         return lock_id, lock_file
 
+    @staticmethod
+    def _get_my_lock_info_bytes() -> bytes:
+        # serialized once per lock() call, and written as is at each attempt
+        return json.dumps({
+            'host' : _hostname,
+            'pid' : os.getpid(),
+            'thread' : threading.get_ident(),
+        }).encode()
+
     def invalidate_cache(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint):
         """ See ``Filoc`` contract """
         if self._cache_loc is None:
@@ -200,84 +276,156 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
         result = []
 
-        running_cache = None  # type:Optional[_RunningCache]
-
         lppms = self.list_paths_and_props_and_meta(constraints, self._meta)
         path_list, path_props_list, meta_props_list = zip(*lppms) if len(lppms) > 0 else ([], [], [])
 
-        log.info(f'Found {len(path_list)} files to read in locpath {self._locpath} fulfilling props {constraints}')
+        log.info('Found %d files to read in locpath %s fulfilling props %s', len(path_list), self._locpath, constraints)
 
         if self._cache_loc:
-            cache_path_list = [
-                self._cache_loc.render_path(path_props)
+            # the cache path depends only on the cache locpath placeholders: it is rendered once per cache file
+            # noinspection PyProtectedMember
+            cache_prop_names = self._cache_loc._sorted_path_props
+            cache_path_by_cache_prop_values = {}
+            cache_path_list = []
+            for path_props in path_props_list:
+                cache_prop_values = tuple(path_props.get(k, None) for k in cache_prop_names)
+                cache_path = cache_path_by_cache_prop_values.get(cache_prop_values, None)
+                if cache_path is None:
+                    cache_path = self._cache_loc.render_path(path_props)
+                    cache_path_by_cache_prop_values[cache_prop_values] = cache_path
+                cache_path_list.append(cache_path)
+            # cache keys are computed once here and reused for the lookup and the update of the cache entries in the loop below
+            cache_key_list = [
+                self._cache_serializer.key(path_props)
                 for path_props
                 in path_props_list
             ]
         else:
             cache_path_list = [None for _ in range(len(path_list))]
+            cache_key_list  = [None for _ in range(len(path_list))]
 
-        # sorted by cache file path to optimize cache file access
-        for (path, path_props, meta_props, cache_path) in sorted(zip(path_list, path_props_list, meta_props_list, cache_path_list), key=lambda tupl: tupl[3] if tupl[3] is not None else ''):
-            path_props_hashable = frozendict(path_props.items())
+        # sorted by cache file path to optimize cache file access: each cache file is loaded and flushed once
+        sorted_entries = sorted(zip(path_list, path_props_list, meta_props_list, cache_path_list, cache_key_list), key=lambda tupl: tupl[3] if tupl[3] is not None else '')
+        for cache_path, cache_entries in groupby(sorted_entries, key=lambda tupl: tupl[3]):
+            cache_entries = list(cache_entries)
 
+            running_cache = None  # type:Optional[_RunningCache]
             if self._cache_loc:
-                if running_cache is not None and running_cache.path == cache_path:
-                    pass  # cache file is always the correct one : do nothing, keep this cache file opened
-                else:
-                    if running_cache is not None and running_cache.path != cache_path:
-                        # flush previous cache, if exists
-                        if running_cache.path:
-                            with self._cache_loc.fs.open(running_cache.path, 'wb') as f:
-                                pickle.dump(running_cache.cache_by_file_path_props, f, )
-
-                    # now prepare new cache file
-                    if self._cache_loc.fs.exists(cache_path):
-                        with self._cache_loc.fs.open(cache_path, 'rb') as f:
-                            running_cache = _RunningCache(cache_path, pickle.load(f))
-                    else:
-                        running_cache = _RunningCache(cache_path, dict())
-
-            # check whether cache entry is still valid
-            if self._cache_loc:
-                if path_props_hashable in running_cache.cache_by_file_path_props:
-                    path_cached_entry = running_cache.cache_by_file_path_props[path_props_hashable]
-                    path_cached_entry_version = path_cached_entry.get(self._cache_version_prop, None)
+                try:
+                    with self._cache_loc.fs.open(cache_path, 'rb') as f:
+                        running_cache = _RunningCache(cache_path, self._cache_serializer.load(f), True)
+                except FileNotFoundError:
+                    running_cache = _RunningCache(cache_path, dict(), False)
+
+            # collect the props lists still valid in cache, and the entries to read
+            props_list_by_entry = [None] * len(cache_entries)  # type: List[Optional[PropsList]]
+            entry_ids_to_read   = []
+            for entry_id, (path, path_props, meta_props, _, cache_key) in enumerate(cache_entries):
+                # check whether cache entry is still valid
+                if running_cache is not None and cache_key in running_cache.cache_by_file_path_props:
+                    path_cached_entry = running_cache.cache_by_file_path_props[cache_key]
+                    path_cached_entry_version = path_cached_entry.get('version', None)
                     meta_version = meta_props.get(self._cache_version_prop, None) if meta_props is not None else None
                     if path_cached_entry_version is not None and meta_version is not None and path_cached_entry_version == meta_version:
-                        log.info(f'Path data cached: "{path}"')
-                        result.extend(path_cached_entry['props_list'].copy())  # copy from cache
+                        log.info('Path data cached: "%s"', path)
+                        props_list_by_entry[entry_id] = path_cached_entry['props_list']  # no copy: the cache is discarded once flushed
                         continue
                     else:
-                        log.info(f'Cache out of date for path "{path}" or no version property found in metadata. Reading directly.')
+                        log.info('Cache out of date for path "%s" or no version property found in metadata. Reading directly.', path)
 
-            # FROM HERE ON: cache is not valid: read path directly!
+                # cache is not valid: path must be read directly
+                entry_ids_to_read.append(entry_id)
 
-            # props from reader (file content from backend)
-            content_props_list = self._read_path(path, path_props, constraints)    # type: PropsList
+            # props from reader (file content from backend), possibly read concurrently
+            content_props_lists = self._read_paths([cache_entries[entry_id][:2] for entry_id in entry_ids_to_read], constraints)
 
-            # augment read props with additional external data
-            for content_path_props in content_props_list:
-                content_path_props.update(path_props)
-                if meta_props is not None:
-                    content_path_props.update(meta_props)
+            for entry_id, content_props_list in zip(entry_ids_to_read, content_props_lists):
+                path, path_props, meta_props, _, cache_key = cache_entries[entry_id]
 
-            # add to result
-            result.extend(content_props_list)
+                # augment read props with additional external data
+                for content_path_props in content_props_list:
+                    content_path_props.update(path_props)
+                    if meta_props is not None:
+                        content_path_props.update(meta_props)
 
-            # add to cache
-            if self._cache_loc:
-                running_cache.cache_by_file_path_props[path_props_hashable] = {
-                    'version': meta_props.get(self._cache_version_prop, None) if meta_props is not None else None,
-                    'props_list' : content_props_list.copy()
-                }
+                props_list_by_entry[entry_id] = content_props_list
 
-        # flush last used cache
-        if running_cache:
-            with self._cache_loc.fs.open(running_cache.path, 'wb') as f:
-                pickle.dump(running_cache.cache_by_file_path_props, f)
+                # add to cache
+                if running_cache is not None:
+                    running_cache.cache_by_file_path_props[cache_key] = {
+                        'version': meta_props.get(self._cache_version_prop, None) if meta_props is not None else None,
+                        'props_list' : content_props_list  # shared with the result: the cache is flushed before the result is returned
+                    }
+
+            # add to result, in the sorted order
+            for props_list in props_list_by_entry:
+                result.extend(props_list)
+
+            # flush cache, only if some entries have been added or updated (i.e. read directly)
+            if running_cache is not None and len(entry_ids_to_read) > 0:
+                self._flush_cache(running_cache)
 
         return result
 
+    def _invalidate_cache_entries(self, cache_path : str, cache_keys : List[Hashable]):
+        try:
+            with self._cache_loc.fs.open(cache_path, 'rb') as f:
+                running_cache = _RunningCache(cache_path, self._cache_serializer.load(f), True)
+        except FileNotFoundError:
+            return
+
+        invalidated_count = 0
+        for cache_key in cache_keys:
+            if running_cache.cache_by_file_path_props.pop(cache_key, None) is not None:
+                invalidated_count += 1
+
+        if invalidated_count > 0:
+            log.info('Invalidating %d entries of cache "%s"', invalidated_count, cache_path)
+            self._flush_cache(running_cache)
+
+    def _flush_cache(self, running_cache : _RunningCache):
+        cache_fs = self._cache_loc.fs
+        if not running_cache.exists:
+            # one round-trip less on remote file systems, when the cache file is simply rewritten
+            cache_fs.makedirs(os.path.dirname(running_cache.path), exist_ok=True)
+        # on local file systems, written to a temporary file first, then renamed (atomic): concurrent readers never load a partially
+        # written cache. The temporary file must not be listed by the cache locpath glob, else `invalidate_cache()` may delete it.
+        # On object stores, a single PUT is already atomic, and a move is a non-atomic copy + delete: the file is written as is
+        tmp_path = None
+        if isinstance(cache_fs, LocalFileSystem):
+            cache_folder, cache_file_name = os.path.split(running_cache.path)
+            tmp_path = f'{cache_folder}/.{cache_file_name}.tmp.{uuid.uuid4().hex}'
+            # noinspection PyProtectedMember
+            if self._cache_loc._matches_glob_path(tmp_path):
+                tmp_path = None
+
+        if tmp_path is None:
+            with cache_fs.open(running_cache.path, 'wb') as f:
+                self._cache_serializer.dump(running_cache.cache_by_file_path_props, f)
+            return
+
+        renamed = False
+        try:
+            # autocommit: within a `fs.transaction` (ex: cache invalidation by `write_contents`), the temporary file must exist before the rename,
+            # instead of being committed at the end of the transaction. Invalidated cache entries are then saved even if the transaction fails: safe
+            with cache_fs.open(tmp_path, 'wb', autocommit=True) as f:
+                self._cache_serializer.dump(running_cache.cache_by_file_path_props, f)
+            os.replace(tmp_path, running_cache.path)
+            renamed = True
+        finally:
+            if not renamed:
+                try:
+                    os.remove(tmp_path)
+                except FileNotFoundError:
+                    pass
+
+    def _read_paths(self, paths_and_path_props : List[Tuple[str, ReadOnlyProps]], constraints : Constraints) -> List[PropsList]:
+        if self._max_read_workers > 1 and len(paths_and_path_props) > 1:
+            # backend reads are mostly I/O bound (especially on remote file systems): threads overlap their latencies
+            with ThreadPoolExecutor(max_workers=self._max_read_workers) as executor:
+                return list(executor.map(lambda path_and_path_props: self._read_path(*path_and_path_props, constraints), paths_and_path_props))
+        return [self._read_path(path, path_props, constraints) for path, path_props in paths_and_path_props]
+
     def write_content(self, content : TContent, dry_run=False):
         """ See ``Filoc`` contract """
         if not self._writable:
@@ -314,29 +462,37 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
         if not self._writable:
             raise UnsupportedOperation('this filoc is not writable. Set writable flag to True to enable writing')
 
-        recorded_row_id_by_path_props    = {}
-        recorded_row_other_props_by_path_props = {}
+        # row_ids (for error messages) and other props, grouped by path props. The group key is the tuple of the path props
+        # values in the sorted placeholder order: cheaper to build and hash than a frozendict per row. The path props of the
+        # first row of each group are kept to render the path
+        recorded_path_props_and_row_ids_and_other_props_by_key = {}  # type: Dict[Tuple[Any, ...], Tuple[Props, List[int], PropsList]]
+        sorted_path_prop_names = self._sorted_path_props
         for row_id, row_props in enumerate(props_list):
             path_props, meta_props, row_other_props = self._split_to_path_meta_and_other_props(row_props)
-            row_path_props_hashable = frozendict(path_props)
-
-            if row_path_props_hashable not in recorded_row_other_props_by_path_props:
-                recorded_row_other_props_by_path_props[row_path_props_hashable] = []
-                recorded_row_id_by_path_props[row_path_props_hashable] = []
-
-            # record change to perform and notice row_id (last is for error message)
-            recorded_row_id_by_path_props[row_path_props_hashable].append(row_id)
-            recorded_row_other_props_by_path_props[row_path_props_hashable].append(row_other_props)
+            key = tuple(path_props.get(k, _missing) for k in sorted_path_prop_names)
+            recorded = recorded_path_props_and_row_ids_and_other_props_by_key.get(key, None)
+            if recorded is None:
+                recorded = recorded_path_props_and_row_ids_and_other_props_by_key[key] = (path_props, [], [])
+            recorded[1].append(row_id)
+            recorded[2].append(row_other_props)
+
+        # invalidate the cache entries of the written paths only: the other entries sharing the same cache file remain valid
+        if self._cache_loc is not None:
+            cache_keys_by_cache_path = {}  # type: Dict[str, List[Hashable]]
+            for path_props, _, _ in recorded_path_props_and_row_ids_and_other_props_by_key.values():
+                cache_path = self._cache_loc.render_path(path_props)
+                cache_keys_by_cache_path.setdefault(cache_path, []).append(self._cache_serializer.key(path_props))
+            for cache_path, cache_keys in cache_keys_by_cache_path.items():
+                self._invalidate_cache_entries(cache_path, cache_keys)
 
         dry_run_log_prefix = '(dry_run) ' if dry_run else ''
-        for path_props, other_props_list in recorded_row_other_props_by_path_props.items():
-            self.invalidate_cache(path_props)
+        for path_props, _, other_props_list in recorded_path_props_and_row_ids_and_other_props_by_key.values():
             path = self.render_path(path_props)
 
-            log.info(f'{dry_run_log_prefix}Saving to {path}')
+            log.info('%sSaving to %s', dry_run_log_prefix, path)
             if not dry_run:
                 self._backend.write(self.fs, path, other_props_list)
-            log.info(f'{dry_run_log_prefix}Saved {path}')
+            log.info('%sSaved %s', dry_run_log_prefix, path)
 
     def _split_to_path_meta_and_other_props(self, keyvalues : ReadOnlyProps) -> Tuple[Props, Props, Props]:
         if self._meta is not None and self._meta_mapping is None:
@@ -344,19 +500,20 @@ class FilocSingle(FilocIO, Filoc[TContent, TContents], ABC):
         path_props  = {}
         meta_props  = {}
         other_props = {}
+        props_by_kind = (path_props, meta_props)
+        prop_kind_by_name = self._prop_kind_by_name
         for (k, v) in keyvalues.items():
-            if k in self._path_props:
-                path_props[k] = v
-            elif self._meta is not None and k in self._meta_mapping:
-                meta_props[k] = v
-            else:
+            kind = prop_kind_by_name.get(k, None)
+            if kind is None:
                 other_props[k] = v
+            else:
+                props_by_kind[kind][k] = v
         return path_props, meta_props, other_props
 
     def _read_path(self, path : str, path_props : Props, constraints : Constraints):
-        log.info(f'Reading content for {path}')
+        log.info('Reading content for %s', path)
         content = self._backend.read(self.fs, path, path_props, constraints)
-        log.info(f'Read content for {path}')
+        log.info('Read content for %s', path)
         return content
 
     def __str__(self) -> str:
@@ -378,6 +535,7 @@ class FilocComposite(Filoc[TContent, TContents], ABC):
             transaction             : bool,
             join_level_name         : str,
             join_separator          : str,
+            max_read_workers        : int = 1,
     ):
         # Validate
         assert isinstance(filoc_by_name, dict)
@@ -390,17 +548,18 @@ class FilocComposite(Filoc[TContent, TContents], ABC):
         self.filoc_by_name   = filoc_by_name
         self.join_level_name = join_level_name
         self.join_separator  = join_separator
+        self._max_read_workers = max_read_workers
 
-        self.join_keys_by_filoc_name = {}  # type: Dict[str, Set[str]]
+        self.join_keys_by_filoc_name = {}  # type: Dict[str, FrozenSet[str]]
         for filoc_name, filoc in filoc_by_name.items():
             # noinspection PyProtectedMember
-            self.join_keys_by_filoc_name[filoc_name] = filoc._path_props
+            self.join_keys_by_filoc_name[filoc_name] = frozenset(filoc._path_props)
+        self._join_key_names = frozenset().union(*self.join_keys_by_filoc_name.values())  # type: FrozenSet[str]
 
     def invalidate_cache(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint):
         """ see ``Filoc`` contract """
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
-        for filoc in self.filoc_by_name.values():
-            filoc.invalidate_cache(constraints)
+        self._map_filocs(lambda _, filoc: filoc.invalidate_cache(constraints), self.filoc_by_name)
 
     def read_content(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint) -> TContent:
         """ see ``Filoc`` contract """
@@ -417,16 +576,11 @@ class FilocComposite(Filoc[TContent, TContents], ABC):
     def _read_props_list(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint) -> PropsList:
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
         # collect
-        props_list_by_filoc_name = {}
-        for filoc_name, filoc in self.filoc_by_name.items():
-            # noinspection PyProtectedMember
-            props_list_by_filoc_name[filoc_name] = filoc._read_props_list(constraints)
+        # noinspection PyProtectedMember
+        props_list_by_filoc_name = self._map_filocs(lambda _, filoc: filoc._read_props_list(constraints), self.filoc_by_name)
 
         # join
-        join_key_names = set()
-        for filoc_join_key_names in self.join_keys_by_filoc_name.values():
-            join_key_names = join_key_names | filoc_join_key_names
-        return merge_tables(props_list_by_filoc_name, list(join_key_names), self.join_separator, self.join_level_name)
+        return merge_tables(props_list_by_filoc_name, self._join_key_names, self.join_separator, self.join_level_name)
 
     def write_content(self, content : TContent, dry_run=False):
         """ see ``Filoc`` contract """
@@ -439,47 +593,69 @@ class FilocComposite(Filoc[TContent, TContents], ABC):
         self._write_props_list(props_list, dry_run=dry_run)
 
     def _write_props_list(self, props_list : ReadOnlyPropsList, dry_run=False):
-        # prepare empty props_list by filoc_name
-        props_list_by_filoc_name = {self.join_level_name: [dict() for _ in range(len(props_list))]}
+        # target filocs: the join level (index columns) and the writable sub-filocs
+        filoc_names = [self.join_level_name]
         for filoc_name, filoc in self.filoc_by_name.items():
             # noinspection PyProtectedMember
             if filoc._writable:
-                props_list_by_filoc_name[filoc_name] = [ dict() for _ in range(len(props_list)) ]
+                filoc_names.append(filoc_name)
             else:
-                log.info(f'write operation skipped for "{filoc_name}" readonly Filoc')
-
-        # then fill
-        split_cache = {}
-        for row_id, props in enumerate(props_list):
-            for (k, v) in props.items():
-
-                split_values = split_cache.get(k, None)
-                if split_values is None:
-                    split_values = k.split(self.join_separator, 1)
-                    split_cache[k] = split_values
+                log.info('write operation skipped for "%s" readonly Filoc', filoc_name)
+        valid_filoc_names = set(filoc_names)
+
+        def split_column(column_name : str) -> Optional[Tuple[str, str]]:
+            # column name -> (filoc_name, prop_name), or None if the column is not written
+            filoc_name_, separator, prop_name_ = column_name.partition(self.join_separator)
+            return (filoc_name_, prop_name_) if separator and filoc_name_ in valid_filoc_names else None
+
+        first_keys = props_list[0].keys() if len(props_list) > 0 else None
+        if first_keys is not None and all(props.keys() == first_keys for props in props_list):
+            # homogeneous rows (e.g. from a DataFrame): columns are split once, and the rows of each filoc are built by comprehension
+            columns_by_filoc_name = {filoc_name: [] for filoc_name in filoc_names}  # type: Dict[str, List[Tuple[str, str]]]
+            for k in first_keys:
+                target = split_column(k)
+                if target is not None:
+                    columns_by_filoc_name[target[0]].append((k, target[1]))
+            props_list_by_filoc_name = {
+                filoc_name: [{prop_name: props[k] for k, prop_name in columns} for props in props_list]
+                for filoc_name, columns in columns_by_filoc_name.items()
+            }
+        else:
+            # heterogeneous rows: split each row into one props per target filoc, in a single pass over the rows
+            props_list_by_filoc_name = {filoc_name: [] for filoc_name in filoc_names}
+            column_map = {}  # type: Dict[str, Optional[Tuple[str, str]]]
+            for props in props_list:
+                props_by_filoc_name = {filoc_name: {} for filoc_name in filoc_names}
+                for (k, v) in props.items():
+                    if k in column_map:
+                        target = column_map[k]
+                    else:
+                        target = column_map[k] = split_column(k)
 
-                filoc_name, prop_name = split_values
+                    if target is not None:
+                        props_by_filoc_name[target[0]][target[1]] = v
 
-                if filoc_name not in props_list_by_filoc_name:
-                    continue
-
-                props_list_by_filoc_name[filoc_name][row_id][prop_name] = v
+                for filoc_name, filoc_props in props_by_filoc_name.items():
+                    props_list_by_filoc_name[filoc_name].append(filoc_props)
 
         # pop out join indexes and merge then row by row to filoc props
         indexes = props_list_by_filoc_name.pop(self.join_level_name)
+        relevant_indexes_by_join_keys = {}  # type: Dict[FrozenSet[str], List[Dict[str, Any]]]  # shared by filocs with the same join keys
         for filoc_name, filoc_props_list in props_list_by_filoc_name.items():
             join_keys = self.join_keys_by_filoc_name[filoc_name]
-            for index, props in zip(indexes, filoc_props_list):
+            relevant_indexes = relevant_indexes_by_join_keys.get(join_keys)
+            if relevant_indexes is None:
                 # todo: iterate through join_keys instead of index and raise explicit exception if join_key missing?
-                relevant_index = { k: v for (k, v) in index.items() if k in join_keys}
-                props.update(relevant_index)
+                relevant_indexes = [{ k: v for (k, v) in index.items() if k in join_keys} if index.keys() & join_keys else None for index in indexes]
+                relevant_indexes_by_join_keys[join_keys] = relevant_indexes
+            for relevant_index, props in zip(relevant_indexes, filoc_props_list):
+                if relevant_index:
+                    props.update(relevant_index)
 
         # delegate writing to
         def save_in_both_cases():
-            for file_name_, props_list_ in props_list_by_filoc_name.items():
-                filoc_ = self.filoc_by_name[file_name_]
-                # noinspection PyProtectedMember
-                filoc_._write_props_list(props_list_, dry_run=dry_run)
+            # noinspection PyProtectedMember
+            self._map_filocs(lambda filoc_name_, filoc_: filoc_._write_props_list(props_list_by_filoc_name[filoc_name_], dry_run=dry_run), props_list_by_filoc_name)
 
         if self.transaction:
 
@@ -506,6 +682,16 @@ class FilocComposite(Filoc[TContent, TContents], ABC):
             # no transaction
             save_in_both_cases()
 
+    def _map_filocs(self, fn : Callable[[str, FilocSingle], Any], filoc_names : Iterable[str]) -> Dict[str, Any]:
+        filoc_names = list(filoc_names)
+        if self._max_read_workers <= 1 or len(filoc_names) <= 1:
+            return {filoc_name: fn(filoc_name, self.filoc_by_name[filoc_name]) for filoc_name in filoc_names}
+        # sub-filocs are independent from each other: their I/O bound operations run concurrently (opt-in, as some fsspec
+        # file systems are not thread-safe)
+        with ThreadPoolExecutor(max_workers=min(self._max_read_workers, len(filoc_names))) as executor:
+            future_by_filoc_name = {filoc_name: executor.submit(fn, filoc_name, self.filoc_by_name[filoc_name]) for filoc_name in filoc_names}
+            return {filoc_name: future.result() for filoc_name, future in future_by_filoc_name.items()}
+
     @contextmanager
     def lock(self, attempt_count: int = 60, attempt_secs: float = 1.0):
         """ See ``Filoc`` contract """
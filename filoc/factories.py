@@ -1,15 +1,19 @@
 """
 This module contains the filoc factories ``filoc(...)``, ``filoc_json(...)``, ``filoc_pandas(...)``.
 """
-from typing import Any, Dict, List, Mapping, Optional, Union, overload
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union, overload, TYPE_CHECKING
 
 from fsspec.spec import AbstractFileSystem
-from pandas.core.frame import DataFrame
-from pandas.core.series import Series
 
-from filoc.contract import BuiltinFrontends, Filoc, BackendContract, FrontendContract, BuiltinBackends, MetaOptions
+from filoc.contract import BuiltinFrontends, Filoc, BackendContract, FrontendContract, BuiltinBackends, MetaOptions, \
+    BuiltinCacheSerializers, CacheSerializerContract
 from filoc.core import FilocSingle, FilocComposite
 
+if TYPE_CHECKING:
+    # pandas is only required by the return type annotations of filoc_pandas: it is not imported at runtime by this module
+    from pandas import DataFrame, Series
+
 _default_frontend        = 'pandas'
 _default_backend         = 'json'
 _default_singleton       = True
@@ -19,44 +23,97 @@ _default_transaction     = True
 _default_meta            = None
 _default_join_level_name = 'shared'
 _default_join_separator  = '.'
+_default_max_read_workers = 1
+_default_cache_serializer = 'pickle'
+
+
+def _frontends():
+    # imported on first use: some frontends and backends depend on heavy optional libraries
+    from filoc import frontends
+    return frontends
+
+
+def _backends():
+    from filoc import backends
+    return backends
+
+
+def _cache_serializers():
+    from filoc import cache_serializers
+    return cache_serializers
 
 
-def _get_frontend(frontend : Union[BuiltinFrontends, FrontendContract]):
-    if frontend == 'json':
-        from filoc.frontends import JsonFrontend
-        return JsonFrontend()
-    elif frontend == 'pandas':
-        from filoc.frontends import PandasFrontend
-        return PandasFrontend()
+# builtin name -> constructor
+_builtin_frontend_factories = {
+    'json'   : lambda: _frontends().JsonFrontend(),
+    'pandas' : lambda: _frontends().PandasFrontend(),
+}  # type: Dict[str, Callable[[], FrontendContract]]
+
+# builtin name -> constructor taking (is_singleton, encoding)
+_builtin_backend_factories = {
+    'path'    : lambda is_singleton, encoding: _backends().PathBackend(),
+    'csv'     : lambda is_singleton, encoding: _backends().CsvBackend(encoding),
+    'json'    : lambda is_singleton, encoding: _backends().JsonBackend(is_singleton, encoding),
+    'pickle'  : lambda is_singleton, encoding: _backends().PickleBackend(is_singleton),
+    'yaml'    : lambda is_singleton, encoding: _backends().YamlBackend(is_singleton, encoding),
+    'parquet' : lambda is_singleton, encoding: _backends().ParquetBackend(),
+}  # type: Dict[str, Callable[[bool, Optional[str]], BackendContract]]
+
+# builtin name -> constructor
+_builtin_cache_serializer_factories = {
+    'pickle'  : lambda: _cache_serializers().PickleCacheSerializer(),
+    'msgpack' : lambda: _cache_serializers().MsgpackCacheSerializer(),
+}  # type: Dict[str, Callable[[], CacheSerializerContract]]
+
+
+def _get_frontend(frontend : Union[BuiltinFrontends, FrontendContract]) -> FrontendContract:
+    if isinstance(frontend, str):
+        return _get_builtin_frontend(frontend)
     else:
         return frontend
 
 
-def _get_backend(backend : Union[BuiltinBackends, BackendContract], is_singleton : bool, encoding : str):
-    if backend == 'path':
-        from filoc.backends import PathBackend
-        return PathBackend()
-    elif backend == 'csv':
-        from filoc.backends import CsvBackend
-        return CsvBackend(encoding)
-    elif backend == 'json':
-        from filoc.backends import JsonBackend
-        return JsonBackend(is_singleton, encoding)
-    elif backend == 'pickle':
-        from filoc.backends import PickleBackend
-        return PickleBackend(is_singleton)
-    elif backend == 'yaml':
-        from filoc.backends import YamlBackend
-        return YamlBackend(is_singleton, encoding)
-    elif backend == 'parquet':
-        from filoc.backends import ParquetBackend
-        return ParquetBackend()
-    elif isinstance(backend, str):
-        raise ValueError(f'Unknown backend: {backend}')
+@lru_cache(maxsize=None)
+def _get_builtin_frontend(frontend : BuiltinFrontends) -> FrontendContract:
+    # builtin frontends are stateless: one instance is shared by all filocs
+    factory = _builtin_frontend_factories.get(frontend, None)
+    if factory is None:
+        raise ValueError(f'Unknown frontend: {frontend}')
+    return factory()
+
+
+def _get_backend(backend : Union[BuiltinBackends, BackendContract], is_singleton : bool, encoding : str) -> BackendContract:
+    if isinstance(backend, str):
+        return _get_builtin_backend(backend, is_singleton, encoding)
     else:
         return backend
 
 
+@lru_cache(maxsize=None)
+def _get_builtin_backend(backend : BuiltinBackends, is_singleton : bool, encoding : str) -> BackendContract:
+    # builtin backends only hold their configuration: one instance per configuration is shared by all filocs
+    factory = _builtin_backend_factories.get(backend, None)
+    if factory is None:
+        raise ValueError(f'Unknown backend: {backend}')
+    return factory(is_singleton, encoding)
+
+
+def _get_cache_serializer(cache_serializer : Union[BuiltinCacheSerializers, CacheSerializerContract]) -> CacheSerializerContract:
+    if isinstance(cache_serializer, str):
+        return _get_builtin_cache_serializer(cache_serializer)
+    else:
+        return cache_serializer
+
+
+@lru_cache(maxsize=None)
+def _get_builtin_cache_serializer(cache_serializer : BuiltinCacheSerializers) -> CacheSerializerContract:
+    # builtin cache serializers are stateless: one instance is shared by all filocs
+    factory = _builtin_cache_serializer_factories.get(cache_serializer, None)
+    if factory is None:
+        raise ValueError(f'Unknown cache serializer: {cache_serializer}')
+    return factory()
+
+
 @overload
 def filoc(
         locpath            : str,
@@ -73,6 +130,8 @@ def filoc(
         join_level_name    : Optional[str]                             = _default_join_level_name,
         join_separator     : Optional[str]                             = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]              = None,
+        max_read_workers   : int                                       = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> FilocSingle:
     """
     Creates a ``Filoc`` instance which allows to read a *set of files* and visualize it as a DataFrame (or another frontend object, if another frontend is passed to the factory), and write changes back to the *set of files*.
@@ -123,6 +182,10 @@ def filoc(
             If you provide a ``cache_locpath`` with placeholders, the cache is then split into multiple files based on the placeholder values.
             It allows you to encapsulate the cache data with original the data structure.
 
+            On a local file system, a cache file is rewritten atomically (written to a hidden temporary file, then renamed), so that concurrent
+            readers never load a partially written cache file. This guarantee is local only: on other file systems, and when the temporary file
+            would match the ``cache_locpath`` glob (ex: a single ``{placeholder}`` file name), the cache file is overwritten in place.
+
         cache_fs:
             Default: None. Allows to provide a custom instance of fsspec file system for the cache files defined by ``cache_locpath``. This may be 
             required, if the protocol used in ``cache_locpath`` needs to be configured or fine-tuned (ex: ``ftp://``).
@@ -151,6 +214,18 @@ def filoc(
             Default: None. Allows to provide a custom instance of fsspec file system. This may be required, if the protocol used in the ``locpath`` needs to be 
             configured or fine-tuned (ex: ``ftp://``).
 
+        max_read_workers:
+            Default: ``1``. Maximal count of threads used to read the files concurrently. Values greater than ``1`` speed up the reading of many files
+            on remote file systems, where each file read is a network round trip. Sibling folders matching a wildcard are listed with the same
+            concurrency, and so are the sub-filocs of a composite filoc.
+
+        cache_serializer:
+            Default: ``'pickle'``. Determines how the cache files defined by ``cache_locpath`` are saved and loaded. The two builtin cache serializers are
+            ``'pickle'`` and ``'msgpack'`` (faster and more compact, but requires the ``msgpack`` package). ``'pickle'`` supports any picklable value.
+            ``'msgpack'`` supports ``None``, ``bool``, ``int``, ``float``, ``str``, ``bytes``, ``list``, ``dict``, ``tuple``, ``datetime``, ``date``, ``Decimal``
+            and numpy scalars: other values raise a ``TypeError`` when the cache is saved. You can also provide your own cache serializer
+            instance, which must implement the ``CacheSerializerContract``.
+
     Returns:
         A ``Filoc`` instance
     """
@@ -173,6 +248,8 @@ def filoc(
         join_level_name    : Optional[str]                             = _default_join_level_name,
         join_separator     : Optional[str]                             = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]              = None,
+        max_read_workers   : int                                       = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> FilocComposite:
     """
     Creates a ``Filoc`` instance which allows to read a *set of files* and visualize it as a DataFrame (or another frontend object, if another frontend is passed to the factory), and write changes back to the *set of files*.
@@ -223,6 +300,10 @@ def filoc(
             If you provide a ``cache_locpath`` with placeholders, the cache is then split into multiple files based on the placeholder values.
             It allows you to encapsulate the cache data with original the data structure.
 
+            On a local file system, a cache file is rewritten atomically (written to a hidden temporary file, then renamed), so that concurrent
+            readers never load a partially written cache file. This guarantee is local only: on other file systems, and when the temporary file
+            would match the ``cache_locpath`` glob (ex: a single ``{placeholder}`` file name), the cache file is overwritten in place.
+
         cache_fs:
             Default: None. Allows to provide a custom instance of fsspec file system for the cache files defined by ``cache_locpath``. This may be 
             required, if the protocol used in ``cache_locpath`` needs to be configured or fine-tuned (ex: ``ftp://``).
@@ -250,6 +331,18 @@ def filoc(
             Default: None. Allows to provide a custom instance of fsspec file system. This may be required, if the protocol used in the ``locpath`` needs to be 
             configured or fine-tuned (ex: ``ftp://``).
 
+        max_read_workers:
+            Default: ``1``. Maximal count of threads used to read the files concurrently. Values greater than ``1`` speed up the reading of many files
+            on remote file systems, where each file read is a network round trip. Sibling folders matching a wildcard are listed with the same
+            concurrency, and so are the sub-filocs of a composite filoc.
+
+        cache_serializer:
+            Default: ``'pickle'``. Determines how the cache files defined by ``cache_locpath`` are saved and loaded. The two builtin cache serializers are
+            ``'pickle'`` and ``'msgpack'`` (faster and more compact, but requires the ``msgpack`` package). ``'pickle'`` supports any picklable value.
+            ``'msgpack'`` supports ``None``, ``bool``, ``int``, ``float``, ``str``, ``bytes``, ``list``, ``dict``, ``tuple``, ``datetime``, ``date``, ``Decimal``
+            and numpy scalars: other values raise a ``TypeError`` when the cache is saved. You can also provide your own cache serializer
+            instance, which must implement the ``CacheSerializerContract``.
+
     Returns:
         A ``Filoc`` instance
     """
@@ -271,30 +364,47 @@ def filoc(
         join_level_name    : Optional[str]                             = _default_join_level_name,
         join_separator     : Optional[str]                             = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]              = None,
+        max_read_workers   : int                                       = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> Filoc:
     frontend_impl = _get_frontend(frontend)
     backend_impl  = _get_backend(backend, singleton, encoding)
 
-    if isinstance(locpath, dict):
+    if isinstance(locpath, str):
+        # Case of single filoc (most common case, checked first)
+        return FilocSingle(
+            locpath            = locpath,
+            writable           = writable,
+            transaction        = transaction,
+            frontend           = frontend_impl,
+            backend            = backend_impl,
+            cache_locpath      = cache_locpath,
+            cache_fs           = cache_fs,
+            cache_version_prop = cache_version_prop,
+            meta               = meta,
+            fs                 = fs,
+            max_read_workers   = max_read_workers,
+            cache_serializer   = _get_cache_serializer(cache_serializer),
+        )
+    elif isinstance(locpath, Mapping):
         # Case of composite filoc
         filoc_by_name = dict()
         for sub_filoc_name, sub_filoc in locpath.items():
             if isinstance(sub_filoc, str):
-                sub_locpath = sub_filoc
-                filoc_instance = filoc(
-                    locpath            = sub_locpath    ,
-                    frontend           = frontend       ,
-                    backend            = backend        ,
-                    singleton          = singleton      ,
-                    writable           = writable       ,
-                    transaction        = transaction    ,
-                    cache_locpath      = None           ,  # Remark: currently cache is not forwarded to sub-filocs
-                    cache_fs           = None           ,  # Remark: currently cache is not forwarded to sub-filocs
-                    cache_version_prop = None           ,  # Remark: currently cache is not forwarded to sub-filocs
-                    meta               = meta           ,
-                    join_level_name    = join_level_name,
-                    join_separator     = join_separator ,
-                    fs                 = fs             ,
+                # frontend and backend are resolved once above, and shared by all sub-filocs
+                filoc_instance = FilocSingle(
+                    locpath            = sub_filoc       ,
+                    writable           = writable        ,
+                    transaction        = transaction     ,
+                    frontend           = frontend_impl   ,
+                    backend            = backend_impl    ,
+                    cache_locpath      = None            ,  # Remark: currently cache is not forwarded to sub-filocs
+                    cache_fs           = None            ,  # Remark: currently cache is not forwarded to sub-filocs
+                    cache_version_prop = None            ,  # Remark: currently cache is not forwarded to sub-filocs
+                    meta               = meta            ,
+                    fs                 = fs              ,
+                    max_read_workers   = max_read_workers,
+                    cache_serializer   = None            ,  # Remark: currently cache is not forwarded to sub-filocs
                 )
             else:
                 filoc_instance = sub_filoc
@@ -306,22 +416,10 @@ def filoc(
             transaction             = transaction,
             join_level_name         = join_level_name,
             join_separator          = join_separator,
-        )
-    elif isinstance(locpath, str):
-        return FilocSingle(
-            locpath            = locpath,
-            writable           = writable,
-            transaction        = transaction,
-            frontend           = frontend_impl,
-            backend            = backend_impl,
-            cache_locpath      = cache_locpath,
-            cache_fs           = cache_fs,
-            cache_version_prop = cache_version_prop,
-            meta               = meta,
-            fs                 = fs,
+            max_read_workers        = max_read_workers,
         )
     else:
-        raise ValueError(f'locpath must be an instance of str or dict, but is {type(locpath)}')
+        raise ValueError(f'locpath must be an instance of str or Mapping, but is {type(locpath)}')
 
 
 @overload
@@ -338,6 +436,8 @@ def filoc_json(
         join_level_name    : Optional[str]                           = _default_join_level_name,
         join_separator     : Optional[str]                           = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]            = None,
+        max_read_workers   : int                                     = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> FilocSingle[Dict[str, Any], List[Dict[str, Any]]]:
     """ Same as filoc(), but with typed return value to improve IDE support """
     ...
@@ -357,6 +457,8 @@ def filoc_json(
         join_level_name    : Optional[str]                           = _default_join_level_name,
         join_separator     : Optional[str]                           = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]            = None,
+        max_read_workers   : int                                     = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> FilocComposite[Dict[str, Any], List[Dict[str, Any]]]:
     """ Same as filoc(), but with typed return value to improve IDE support """
     ...
@@ -375,6 +477,8 @@ def filoc_json(
         join_level_name    : Optional[str]                           = _default_join_level_name,
         join_separator     : Optional[str]                           = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]            = None,
+        max_read_workers   : int                                     = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> Union[
         FilocSingle   [Dict[str, Any], List[Dict[str, Any]]],
         FilocComposite[Dict[str, Any], List[Dict[str, Any]]]
@@ -382,7 +486,7 @@ def filoc_json(
     """ Same as filoc(), but with typed return value to improve IDE support """
     loc = filoc(
         locpath            = locpath              ,
-        frontend           = _get_frontend('json'),
+        frontend           = 'json'               ,
         backend            = backend              ,
         singleton          = singleton            ,
         writable           = writable             ,
@@ -394,6 +498,8 @@ def filoc_json(
         join_level_name    = join_level_name      ,
         join_separator     = join_separator       ,
         fs                 = fs                   ,
+        max_read_workers   = max_read_workers     ,
+        cache_serializer   = cache_serializer     ,
     )
     return loc
 
@@ -412,7 +518,9 @@ def filoc_pandas(
         join_level_name    : Optional[str]                           = _default_join_level_name,
         join_separator     : Optional[str]                           = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]            = None,
-) -> FilocSingle[Series, DataFrame]:
+        max_read_workers   : int                                     = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
+) -> 'FilocSingle[Series, DataFrame]':
     """ Same as filoc(), but with typed return value to improve IDE support """
     ...
 
@@ -431,7 +539,9 @@ def filoc_pandas(
         join_level_name    : Optional[str]                           = _default_join_level_name,
         join_separator     : Optional[str]                           = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]            = None,
-) -> FilocComposite[Series, DataFrame]:
+        max_read_workers   : int                                     = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
+) -> 'FilocComposite[Series, DataFrame]':
     """ Same as filoc(), but with typed return value to improve IDE support """
     ...
 
@@ -449,14 +559,16 @@ def filoc_pandas(
         join_level_name    : Optional[str]                           = _default_join_level_name,
         join_separator     : Optional[str]                           = _default_join_separator,
         fs                 : Optional[AbstractFileSystem]            = None,
+        max_read_workers   : int                                     = _default_max_read_workers,
+        cache_serializer   : Union[BuiltinCacheSerializers, CacheSerializerContract] = _default_cache_serializer,
 ) -> Union[
-    FilocSingle[Series, DataFrame],
-    FilocComposite[Series, DataFrame]
+    'FilocSingle[Series, DataFrame]',
+    'FilocComposite[Series, DataFrame]'
 ]:
     """ Same as filoc(), but with typed return value to improve IDE support """
     loc = filoc(
         locpath            = locpath                ,
-        frontend           = _get_frontend('pandas'),
+        frontend           = 'pandas'               ,
         backend            = backend                ,
         singleton          = singleton              ,
         writable           = writable               ,
@@ -468,5 +580,7 @@ def filoc_pandas(
         join_level_name    = join_level_name        ,
         join_separator     = join_separator         ,
         fs                 = fs                     ,
+        max_read_workers   = max_read_workers       ,
+        cache_serializer   = cache_serializer       ,
     )
     return loc
@@ -2,16 +2,19 @@
 This module contains the FilocIO class, used to work with files defined by a locpath: a path containing format placeholders.
 """
 import datetime
+import fnmatch
 import logging
 import os
 import re
+import string
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import UnsupportedOperation
-from typing import Dict, Any, List, Mapping, Optional, Set
+from typing import Dict, Any, Callable, List, Mapping, Optional, Set
 from typing import Tuple
 
 import fsspec
-import pandas as pd
 
 from filoc.fmt_parser import FmtParser
 from fsspec import AbstractFileSystem
@@ -26,20 +29,47 @@ log = logging.getLogger('filoc')
 # Constants
 # ---------
 _re_natural           = re.compile(r"(\d+)")
+_split_natural        = _re_natural.split
 _re_path_placeholder  = re.compile(r'({[^}]+})')
+_path_cache_size      = 4096
+_locpath_cache_size   = 1024
+_sort_key_cache_size  = 65536
+_re_glob_magic        = re.compile(r'[*?\[]')
 
 
 # -------
 # Helpers
 # -------
+@lru_cache(maxsize=_sort_key_cache_size)  # the same paths are listed and sorted again on each read: their keys are reused
 def natural_sort_key(s: str) -> Tuple[Any, ...]:
     """ Return a tuple of string and int, to be used as key for natural sort. Floating number are currently supported but cannot be compared to integers (missing dot separator)"""
     # TODO: support mix of int and float
-    return [int(part) if part.isdigit() else part for part in _re_natural.split(s)]
+    # the capturing split alternates text and digit parts: digit parts are at odd indexes
+    parts = _split_natural(s)
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+@lru_cache(maxsize=_locpath_cache_size)
+def _get_path_parser(locpath: str) -> FmtParser:
+    """ Return the parser of ``locpath``, shared by the FilocIO instances with the same locpath (a FmtParser is not modified once built) """
+    return FmtParser(locpath)
+
+
+@lru_cache(maxsize=_locpath_cache_size)
+def _compile_render_plan(fmt: str) -> Optional[Tuple[Tuple[str, Optional[str], str], ...]]:
+    """ Split ``fmt`` once into (literal text, field name, format spec) triples, or return None if ``fmt`` uses format features (conversion, attribute or item access, nested spec) left to ``str.format`` """
+    plan = []
+    for literal_text, field, format_spec, conversion in string.Formatter().parse(fmt):
+        if field is not None and (conversion is not None or '.' in field or '[' in field or '{' in format_spec):
+            return None
+        plan.append((literal_text, field, format_spec))
+    return tuple(plan)
 
 
 def sort_natural(li: List[str]) -> List[str]:
     """ Perform natural sort of string containing numbers. Floating number are currently supported but cannot be compared to integers (missing dot separator)"""
+    # remark: sorted() computes the key once per element
     return sorted(li, key=natural_sort_key)
 
 
@@ -77,12 +107,8 @@ def mix_dicts_and_coerce(dict1, dict2) -> Mapping[str, Any]:
     dict1 = coerce_nullable_mapping(dict1)
     dict2 = coerce_nullable_mapping(dict2)
 
-    dict2 = None if len(dict2) == 0 else dict2
     if dict1 and dict2:
-        result = dict()
-        result.update(dict1)
-        result.update(dict2)
-        return result
+        return {**dict1, **dict2}
     elif dict1:
         return dict1
     elif dict2:
@@ -107,13 +133,31 @@ def get_meta_mapping(meta_options: MetaOptions) -> Optional[Dict[str, str]]:
 
 
 def map_meta(meta_mapping: Optional[Dict[str, str]], meta: Dict[str, Any]) -> Dict[str, Any]:
-    meta_flat = pd.json_normalize(meta).to_dict(orient='records')[0]
+    meta_flat = flatten_meta(meta)
     if meta_mapping is None:
         return meta_flat
     else:
         return {name: meta_flat.get(original_name, None) for name, original_name in meta_mapping.items()}
 
 
+def flatten_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """ Flatten the nested dictionaries of ``meta`` into ``.`` separated keys, with the same keys and key order as ``pandas.json_normalize`` """
+    meta_flat = {k: v for k, v in meta.items() if not isinstance(v, dict)}
+    for k, v in meta.items():
+        if isinstance(v, dict):
+            _flatten_nested_meta(v, str(k), meta_flat)
+    return meta_flat
+
+
+def _flatten_nested_meta(meta: Dict[str, Any], key_prefix: str, meta_flat: Dict[str, Any]):
+    for k, v in meta.items():
+        key = f'{key_prefix}.{k}'
+        if isinstance(v, dict):
+            _flatten_nested_meta(v, key, meta_flat)
+        else:
+            meta_flat[key] = v
+
+
 def jsonify_detail(d):
     if isinstance(d, datetime.datetime):
         return d.isoformat()
@@ -149,11 +193,13 @@ class FilocIO:
     def __init__(
         self, locpath: str, 
         writable: bool = False, 
-        fs: AbstractFileSystem = None
+        fs: AbstractFileSystem = None,
+        max_list_workers: int = 1,
     ) -> None:
         super().__init__()
         self._original_locpath = locpath
         self._writable  = writable
+        self._max_list_workers = max_list_workers
 
         # split locpath to distinguish placeholders from constant parts
         path_elts = _re_path_placeholder.split(locpath)
@@ -162,29 +208,41 @@ class FilocIO:
         # which is normalized. But the placeholders within the locpath are not valid, so we replace them by
         # a valid random string, build the OpenFile, get the normalized string, and replace the random
         # string by the original placeholders.
-        path_elts_and_ersatz = [ (elt, str(uuid.uuid4()) if elt.startswith("{") else None) for elt in path_elts ]
-        some_valid_path = "".join([ersatz if ersatz else elt for elt, ersatz in path_elts_and_ersatz])
+        # The split alternates constant parts and placeholders: the placeholders are at odd indexes. A single random
+        # token, suffixed by the placeholder index, stands for each of them, and all are restored in a single pass.
+        placeholders = path_elts[1::2]
+        ersatz_token = uuid.uuid4().hex
+        some_valid_path = "".join([f'{ersatz_token}{idx // 2}_' if idx % 2 == 1 else elt for idx, elt in enumerate(path_elts)])
         if fs is None:
             open_file = fsspec.open(some_valid_path)
         else:
             open_file = OpenFile(fs, some_valid_path)
 
-        # now build the normalized locpath, by replacing ersatz string by the original placeholder strings
-        self._locpath = open_file.path
-        for elt, ersatz in path_elts_and_ersatz:
-            if ersatz:
-                self._locpath = self._locpath.replace(ersatz, elt)
+        # now build the normalized locpath, by replacing ersatz strings by the original placeholder strings
+        self._locpath = re.sub(ersatz_token + r'(\d+)_', lambda m: placeholders[int(m.group(1))], open_file.path)
 
         self._fs = open_file.fs  # type: AbstractFileSystem
-        self._path_parser = FmtParser(self._locpath)
+        self._path_parser = _get_path_parser(self._locpath)
 
         # Get the root folder: the last folder, that is not variable
         self._root_folder = self._locpath.split("{")[0] 
         self._root_folder = self.fs.sep.join((self._root_folder + "dummy_to_ensure_subfolder").split(self.fs.sep)[:-1])  
 
-        # parse library contains the _named_fields property, which provides us with the set of placeholder names
-        # noinspection PyProtectedMember
-        self._path_props  = set(self._path_parser.field_names)
+        # set of placeholder names. Frozen, as it is shared (i.e. with composite join keys) and used for membership tests in hot loops
+        self._path_props  = frozenset(self._path_parser.field_names)
+        self._sorted_path_props = tuple(sorted(self._path_props))
+
+        # regex matching any `{placeholder}` or `{placeholder:any_optional_formatting}`, used to render glob paths
+        self._placeholder_re = re.compile(r'{(' + '|'.join(map(re.escape, self._sorted_path_props)) + r')(?::[^}]*)?}')
+
+        # literal and placeholder parts of the locpath, split once: rendering a path does not parse the locpath again
+        self._render_plan = _compile_render_plan(self._locpath)
+        # locpath without placeholder: a single path, rendered once
+        self._constant_path = self._render_path(()) if len(self._path_props) == 0 else None
+
+        # path rendering and parsing are pure functions of the locpath: their results are memoized per instance
+        self._render_path_cached           = lru_cache(maxsize=_path_cache_size)(self._render_typed_path)
+        self._parse_path_properties_cached = lru_cache(maxsize=_path_cache_size)(self._parse_path_properties)
 
     @property
     def fs(self) -> AbstractFileSystem:
@@ -200,6 +258,10 @@ class FilocIO:
         Returns:
             A dictionary containing the "placeholder name" -> value mapping
         """
+        # copy, as the caller may modify the returned dictionary
+        return dict(self._parse_path_properties_cached(path))
+
+    def _parse_path_properties(self, path: str) -> Dict[str, Any]:
         try:
             return self._path_parser.parse(path)
         except Exception as e:
@@ -217,12 +279,38 @@ class FilocIO:
         Raises:
             ValueError: If a placeholder value is missing
         """
+        if self._constant_path is not None:
+            return self._constant_path
+
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
-        undefined_keys = self._path_props - set(constraints)
+        undefined_keys = self._path_props.difference(constraints)
 
         if len(undefined_keys) > 0:
             raise ValueError('Required props undefined: {}. Provided: {}'.format(undefined_keys, constraints))
-        return self._locpath.format(**constraints)  # result should be normalized, because locpath is
+
+        # only the placeholder values are relevant: they build the memoization key, along with their types, as equal values
+        # of different types (ex: 1, 1.0 and True) may be rendered differently (or be rejected by the format spec)
+        path_prop_values = tuple(constraints[k] for k in self._sorted_path_props)
+        try:
+            return self._render_path_cached(tuple((type(v), v) for v in path_prop_values))
+        except TypeError:
+            # unhashable placeholder value: no memoization
+            return self._render_path(path_prop_values)
+
+    def _render_typed_path(self, typed_path_prop_values: Tuple[Tuple[type, Any], ...]) -> str:
+        return self._render_path(tuple(v for _, v in typed_path_prop_values))
+
+    def _render_path(self, path_prop_values: Tuple[Any, ...]) -> str:
+        path_values = dict(zip(self._sorted_path_props, path_prop_values))
+        if self._render_plan is None:
+            return self._locpath.format(**path_values)  # result should be normalized, because locpath is
+
+        parts = []
+        for literal_text, field, format_spec in self._render_plan:
+            parts.append(literal_text)
+            if field is not None:
+                parts.append(format(path_values[field], format_spec))
+        return ''.join(parts)  # result should be normalized, because locpath is
 
     def render_glob_path(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint) -> str:
         """
@@ -235,24 +323,100 @@ class FilocIO:
         Returns:
             A glob path
         """
-        constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
-        provided_keys = set(constraints)
-
-        undefined_keys = self._path_props - provided_keys
-        defined_keys = self._path_props - undefined_keys
+        if self._constant_path is not None:
+            return self._constant_path
 
-        path_values = dict()
-        path_values.update({(k, constraints[k]) for k in defined_keys})
-
-        glob_path = self._locpath
-        for undefined_key in undefined_keys:
-            # replace `{undefined_key:any_optional_formatting}` by `*`
-            glob_path = re.sub(r'{' + undefined_key + r'(?::[^}]*)?}', '*', glob_path)
+        constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
+        undefined_keys = self._path_props.difference(constraints)
+        if len(undefined_keys) == 0:
+            # no wildcard: the glob path is the (memoized) rendered path
+            return self.render_path(constraints)
+
+        if self._render_plan is not None:
+            # the precomputed locpath parts are joined directly: undefined placeholders become `*`
+            parts = []
+            for literal_text, field, format_spec in self._render_plan:
+                parts.append(literal_text)
+                if field is not None:
+                    parts.append('*' if field in undefined_keys else format(constraints[field], format_spec))
+            return ''.join(parts)  # result should be normalized, because locpath is
+
+        # replace each `{undefined_key:any_optional_formatting}` by `*`, in a single pass
+        glob_path = self._placeholder_re.sub(lambda m: '*' if m.group(1) in undefined_keys else m.group(0), self._locpath)
 
         # finally format
+        path_values = {k: constraints[k] for k in self._path_props if k not in undefined_keys}
         glob_path = glob_path.format(**path_values)
         return glob_path  # result should be normalized, because locpath is
 
+    def _matches_glob_path(self, path: str) -> bool:
+        """ Whether ``path`` is listed by globbing the locpath with undefined placeholders (i.e. by ``list_paths()`` or ``delete()``) """
+        sep = self.fs.sep
+        glob_segments = self.render_glob_path().split(sep)
+        path_segments = path.split(sep)
+        return len(glob_segments) == len(path_segments) and all(fnmatch.fnmatchcase(p, g) for p, g in zip(path_segments, glob_segments))
+
+    def _glob_detail(self, glob_path: str) -> Dict[str, Dict[str, Any]]:
+        """ Same result as ``fs.glob(glob_path, detail=True)``, but lists only the folders matching the glob path """
+        sep = self.fs.sep
+        segments = glob_path.split(sep)
+        magic_ids = [idx for idx, segment in enumerate(segments) if _re_glob_magic.search(segment)]
+        root = sep.join(segments[:magic_ids[0]]) if len(magic_ids) > 0 else ''
+        if root == '' or len(magic_ids) == len(segments) - magic_ids[0]:
+            # no constant segment below the first wildcard: `glob` lists nothing unnecessary
+            return self.fs.glob(glob_path, detail=True)
+
+        # `glob` would list the whole tree below the first wildcard: walk level by level instead, listing only the matching folders
+        candidates = [root]
+        detail_by_path = {}
+        for idx in range(magic_ids[0], len(segments)):
+            segment = segments[idx]
+            is_last = idx == len(segments) - 1
+            if not _re_glob_magic.search(segment):
+                candidates = [candidate + sep + segment for candidate in candidates]
+                continue
+            match = re.compile(fnmatch.translate(segment)).match
+            detail_by_path = {}
+            for candidate, entries in zip(candidates, self._ls_folders(candidates)):
+                for entry in entries:
+                    path = entry['name'].rstrip(sep)
+                    if not path.startswith(candidate + sep):
+                        continue  # `ls` of a file returns the file itself
+                    if match(path[len(candidate) + 1:]) and (is_last or entry.get('type', None) == 'directory'):
+                        detail_by_path[path] = entry
+            candidates = list(detail_by_path)
+
+        if _re_glob_magic.search(segments[-1]):
+            return detail_by_path
+
+        # the last segments are constant: the candidates are checked, concurrently as the listings above
+        return {candidate: detail for candidate, detail in zip(candidates, self._info_paths(candidates)) if detail is not None}
+
+    def _ls_folders(self, folders: List[str]) -> List[List[Dict[str, Any]]]:
+        """ List the details of each folder (empty if missing), concurrently if ``max_list_workers`` > 1 """
+        def ls_folder(folder):
+            try:
+                return self.fs.ls(folder, detail=True)
+            except (FileNotFoundError, NotADirectoryError):
+                return []
+        return self._map_fs_calls(ls_folder, folders)
+
+    def _info_paths(self, paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """ Get the details of each path (None if missing), concurrently if ``max_list_workers`` > 1 """
+        def info_path(path):
+            try:
+                return self.fs.info(path)
+            except (FileNotFoundError, NotADirectoryError):
+                return None
+        return self._map_fs_calls(info_path, paths)
+
+    def _map_fs_calls(self, fn: Callable[[str], Any], paths: List[str]) -> List[Any]:
+        if self._max_list_workers > 1 and len(paths) > 1:
+            # the calls on sibling paths are independent: their round trips overlap
+            with ThreadPoolExecutor(max_workers=self._max_list_workers) as executor:
+                return list(executor.map(fn, paths))
+        return [fn(path) for path in paths]
+
     def list_paths(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint) -> List[str]:
         """
         Gets the list of all existing and valid paths fulfilling the provided constraints
@@ -264,7 +428,7 @@ class FilocIO:
             The list of valid and existing paths fulfilling the provided constraints
         """
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
-        return sort_natural(self.fs.glob(self.render_glob_path(constraints)))
+        return sort_natural(list(self._glob_detail(self.render_glob_path(constraints))))
 
     def list_paths_and_props(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint) -> List[Tuple[str, Dict[str, Any]]]:
         """
@@ -277,7 +441,7 @@ class FilocIO:
             A list of tuples containing for each valid path, the path and the list of related placeholder values
         """
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
-        paths = sort_natural(self.fs.glob(self.render_glob_path(constraints)))
+        paths = sort_natural(list(self._glob_detail(self.render_glob_path(constraints))))
         return [(p, self.parse_path_properties(p)) for p in paths]
 
     def list_paths_and_props_and_meta(
@@ -294,7 +458,7 @@ class FilocIO:
             meta:
                 Default: True. Adds file metadata as property/column to the result.
                 If None or False, no metadata is added.
-                If True: all metadata are added (flattened with pandas normalize function).
+                If True: all metadata are added (nested metadata flattened as with pandas normalize function).
                 If a string or a list of strings: only the metadata with the given keys are added.
                 If a mapping: A key is the resulting name and the value is the original metadata key.
             **constraints_kwargs: The equality constraints applied to the ``locpath`` placeholders
@@ -304,9 +468,20 @@ class FilocIO:
         """
         meta_mapping = get_meta_mapping(meta)
         constraints = mix_dicts_and_coerce(constraints, constraints_kwargs)
-        detail_by_path = self.fs.glob(self.render_glob_path(constraints), detail=True)
-        detail_by_path = {p: jsonify_detail(d) for p, d in detail_by_path.items()}
-        result = [(path, self.parse_path_properties(path), map_meta(meta_mapping, detail)) for path, detail in detail_by_path.items()]
+        if self._path_props.issubset(constraints):
+            # all placeholders are constrained: at most one path, fetched with a single `info` call instead of a glob
+            path = self.render_path(constraints)
+            try:
+                detail_by_path = {path: self.fs.info(path)}
+            except FileNotFoundError:
+                detail_by_path = {}
+        else:
+            detail_by_path = self._glob_detail(self.render_glob_path(constraints))
+        if meta_mapping is not None and len(meta_mapping) == 0:
+            # no metadata requested: the details are neither converted nor flattened
+            result = [(path, self.parse_path_properties(path), {}) for path in detail_by_path]
+        else:
+            result = [(path, self.parse_path_properties(path), map_meta(meta_mapping, jsonify_detail(detail))) for path, detail in detail_by_path.items()]
         return sorted(result, key=lambda x: natural_sort_key(x[0]))
 
     def exists(self, constraints : Optional[Constraints] = None, **constraints_kwargs : Constraint) -> bool:
@@ -371,18 +546,22 @@ class FilocIO:
         if not self._writable:
             raise UnsupportedOperation('this filoc is not writable. Set writable flag to True to enable deleting')
 
-        path_to_delete = self.list_paths(constraints)
+        # the glob details provide the path types: no per-path stat calls required to distinguish files from directories
+        constraints = mix_dicts_and_coerce(constraints, {})
+        detail_by_path = self._glob_detail(self.render_glob_path(constraints))
+        path_to_delete = sort_natural(list(detail_by_path))
 
         dry_run_log_prefix = '(dry_run) ' if dry_run else ''
-        log.info(f'{dry_run_log_prefix}Deleting {len(path_to_delete)} files with path_props "{constraints}"')
+        log.info('%sDeleting %d files with path_props "%s"', dry_run_log_prefix, len(path_to_delete), constraints)
         for path in path_to_delete:
-            log.info(f'{dry_run_log_prefix}Deleting "{path}"')
+            log.info('%sDeleting "%s"', dry_run_log_prefix, path)
             if dry_run:
                 continue
-            if self.fs.isfile(path):
+            path_type = detail_by_path[path].get('type', None)
+            if path_type == 'file' or (path_type != 'directory' and self.fs.isfile(path)):
                 self.fs.delete(path)
-            elif self.fs.isdir(path):
+            elif path_type == 'directory' or self.fs.isdir(path):
                 self.fs.rm(path, recursive=True)
             else:
                 raise ValueError(f'path is neither a direction nor a file: "{path}"')
-        log.info(f'{dry_run_log_prefix}Deleted {len(path_to_delete)} files with path_props "{constraints}"')
+        log.info('%sDeleted %d files with path_props "%s"', dry_run_log_prefix, len(path_to_delete), constraints)
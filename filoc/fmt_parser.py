@@ -149,9 +149,24 @@ class FmtParser:
             if field is not None:
                 segment_parsers.append(convert_field_to_segment_parser(literal_text, field, format_spec, conversion))
 
-        self.regex_string = ''.join(f'({p["regex"]})' for p in segment_parsers)
+        # only the fields are captured, in named groups: the groups possibly contained in the field regexes (ex: float exponent)
+        # do not shift the field values, and the literal segments are matched without capture
+        regex_parts = []
+        field_parsers = []
+        for p in segment_parsers:
+            if p["field"] is None:
+                regex_parts.append(p["regex"])
+            else:
+                group_name = f'_{len(field_parsers)}'
+                regex_parts.append(f'(?P<{group_name}>{p["regex"]})')
+                field_parsers.append((group_name, p["field"], p["parser"]))
+
+        self.regex_string = ''.join(regex_parts)
         self.regex = re.compile(self.regex_string)
         self.segment_parsers = segment_parsers
+        self._field_parsers = field_parsers
+        # when no field is repeated, no values need to be merged: parse builds the result in a single comprehension
+        self._has_unique_fields = len(set(field for _, field, _ in field_parsers)) == len(field_parsers)
 
     @property
     def field_names(self) -> Set[str]:
@@ -161,12 +176,14 @@ class FmtParser:
         a = self.regex.fullmatch(txt)
         if a is None:
             raise ValueError(f"Could not parse '{txt}' with format '{self.fmt}' (regex: '{self.regex_string}')")
+        if self._has_unique_fields:
+            try:
+                return {field: parser(a.group(group_name)) for group_name, field, parser in self._field_parsers}
+            except Exception:
+                pass  # parsed again below, to report the failing value parser
         result = {}
-        for idx, (p, g) in enumerate(zip(self.segment_parsers, a.groups())):
-            field = p["field"]
-            if field is None:
-                continue
-            parser = p["parser"]
+        for group_name, field, parser in self._field_parsers:
+            g = a.group(group_name)
             try:
                 value = parser(g)
                 if field in result:
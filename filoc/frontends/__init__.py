@@ -1,8 +1,19 @@
 """ This module contains the filoc default frontend implementations """
+import sys
+
 from .frontend_json import JsonFrontend
-from .frontend_pandas import PandasFrontend
 
 __all__     = [
     'JsonFrontend',
     'PandasFrontend',
 ]
+
+# The pandas frontend is imported on first access (PEP 562), as importing pandas is costly and not required by the other frontends
+if sys.version_info < (3, 7):
+    from .frontend_pandas import PandasFrontend
+else:
+    def __getattr__(name):
+        if name == 'PandasFrontend':
+            from .frontend_pandas import PandasFrontend
+            return PandasFrontend
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
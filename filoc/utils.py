@@ -73,6 +73,7 @@ def merge_tables(
     separator       : str, 
     join_level_name : str
 ):
+    join_keys          = join_keys if isinstance(join_keys, (set, frozenset)) else set(join_keys)
     prefixed_join_keys = set([f'{join_level_name}{separator}{k}' for k in join_keys])
         
     resulting_table = None
@@ -84,14 +85,23 @@ def merge_tables(
 
 def _prefix_table(
     table          : Table, 
-    join_key_names : Iterable[str],
+    join_key_names : Set[str],
     table_name     : str,
     separator      : str,
     join_level_name: str,
 ):
+    # rows of a table mostly share the same keys: compute each prefixed key once
+    prefixed_key_by_key = {}
     result = []
     for item in table:
-        result.append({  f'{join_level_name}{separator}{k}' if k in join_key_names else f'{table_name}{separator}{k}' : v  for k, v in item.items()  })
+        row = {}
+        for k, v in item.items():
+            prefixed_key = prefixed_key_by_key.get(k)
+            if prefixed_key is None:
+                prefixed_key = f'{join_level_name}{separator}{k}' if k in join_key_names else f'{table_name}{separator}{k}'
+                prefixed_key_by_key[k] = prefixed_key
+            row[prefixed_key] = v
+        result.append(row)
     return result
 
 
@@ -165,7 +175,7 @@ def _get_index_matches_recursive(index, key_values):
     else:
         next_keyvalues = key_values[1:]
         if key_value    in index: r1 = _get_index_matches_recursive(index[key_value]   , next_keyvalues)
-        if _MISSING_KEY in index: r1 = _get_index_matches_recursive(index[_MISSING_KEY], next_keyvalues)
+        if _MISSING_KEY in index: r2 = _get_index_matches_recursive(index[_MISSING_KEY], next_keyvalues)
     return _combine_list(r1, r2)
             
 
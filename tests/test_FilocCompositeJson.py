@@ -1,6 +1,7 @@
 import json
 import shutil
 import tempfile
+import threading
 import unittest
 
 # noinspection DuplicatedCode
@@ -26,6 +27,20 @@ class TestMultiloc(unittest.TestCase):
     def test_read_contents(self):
         pass
 
+    def test_sub_filocs_accessed_in_calling_thread_by_default(self):
+        self.conf_wloc.write_contents([{"simid": 1, "confA" : "Q"}])
+        mloc = filoc_json({'conf' : self.conf_loc, 'hyp' : self.hyp_loc})
+
+        thread_ids = set()
+        for sub_loc in (self.conf_loc, self.hyp_loc):
+            def tracking_read_props_list(constraints, read_props_list=sub_loc._read_props_list):
+                thread_ids.add(threading.get_ident())
+                return read_props_list(constraints)
+            sub_loc._read_props_list = tracking_read_props_list
+
+        mloc.read_contents()
+        self.assertEqual({threading.get_ident()}, thread_ids)
+
     def test_write_and_read_contents(self):
         # ACT 1 (write)
         self.conf_wloc.write_contents([
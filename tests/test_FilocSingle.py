@@ -8,6 +8,7 @@ import unittest
 from pathlib import Path
 
 from filoc import filoc_json, FilocIO
+from filoc.cache_serializers import PickleCacheSerializer
 
 
 # noinspection PyMissingOrEmptyDocstring
@@ -112,6 +113,16 @@ class TestFilocSingle(unittest.TestCase):
         self.assertEqual(len(p), 1)
         self.assertEqual('[{"a": 300, "epid": 10, "simid": 2}]', json.dumps(p, sort_keys=True))
 
+    def test_read_contents_with_concurrent_reads(self):
+        wloc = FilocIO(self.path_fmt, writable=True)
+        for simid in range(1, 4):
+            for epid in range(1, 4):
+                with wloc.open({"simid": simid, "epid": epid}, "w") as f: json.dump({'a': simid * 100 + epid}, f)
+
+        loc = filoc_json(self.path_fmt, max_read_workers=4)
+        p = loc.read_contents({'epid': 2})
+        self.assertEqual('[{"a": 102, "epid": 2, "simid": 1}, {"a": 202, "epid": 2, "simid": 2}, {"a": 302, "epid": 2, "simid": 3}]', json.dumps(p, sort_keys=True))
+
     def test_read_contents_with_cache(self):
         print("write files")
         wloc = FilocIO(self.path_fmt, writable=True)
@@ -155,6 +166,98 @@ class TestFilocSingle(unittest.TestCase):
         self.assertEqual('[{"a": 100, "epid": 10, "simid": 1}, {"a": 333, "epid": 10, "simid": 2}]',
                          json.dumps(p, sort_keys=True))
 
+    def test_read_contents_from_cache(self):
+        wloc = FilocIO(self.path_fmt, writable=True)
+        with wloc.open({"simid": 1, "epid": 10}, "w") as f: json.dump({'a': 100}, f)
+        with wloc.open({"simid": 2, "epid": 10}, "w") as f: json.dump({'a': 300}, f)
+
+        loc = filoc_json(self.path_fmt, cache_locpath=self.test_dir + '/.cache', cache_version_prop='mtime', meta='mtime')
+        loc.read_contents({'epid': 10})
+
+        # the second read must be served by the cache, without reading the files
+        def fail_read(*args):
+            raise AssertionError('file read instead of cache hit')
+        loc._read_path = fail_read
+        p = loc.read_contents({'epid': 10})
+        self.assertEqual('[{"a": 100, "epid": 10, "simid": 1}, {"a": 300, "epid": 10, "simid": 2}]',
+                         json.dumps([{k: v for k, v in r.items() if k != 'mtime'} for r in p], sort_keys=True))
+
+    def test_read_contents_cache_flushed_only_when_updated(self):
+        wloc = FilocIO(self.path_fmt, writable=True)
+        with wloc.open({"simid": 1, "epid": 10}, "w") as f: json.dump({'a': 100}, f)
+
+        # cache folder does not exist yet: it is created by the flush
+        loc = filoc_json(self.path_fmt, cache_locpath=self.test_dir + '/cache/simid={simid:d}', cache_version_prop='mtime', meta='mtime')
+        loc.read_contents()
+        self.assertEqual(['simid=1'], os.listdir(self.test_dir + '/cache'))
+
+        # all entries served by the cache: nothing to flush
+        def fail_flush(*args):
+            raise AssertionError('cache flushed without update')
+        loc._flush_cache = fail_flush
+        p = loc.read_contents()
+        self.assertEqual([100], [r['a'] for r in p])
+
+    def test_write_contents_invalidates_cache(self):
+        loc = filoc_json(self.path_fmt, writable=True, cache_locpath=self.test_dir + '/cache_simid={simid:d}', cache_version_prop='size', meta='size')
+        loc.write_contents([{"simid": 1, "epid": 10, 'a': 100, 'size': None}, {"simid": 1, "epid": 20, 'a': 200, 'size': None}])
+        loc.read_contents()
+
+        # same file size: only the cache invalidation on write ensures that the new content is read
+        loc.write_contents([{"simid": 1, "epid": 10, 'a': 333, 'size': None}, {"simid": 1, "epid": 20, 'a': 444, 'size': None}])
+        p = loc.read_contents()
+        self.assertEqual([333, 444], [r['a'] for r in p])
+
+    def test_write_contents_invalidates_written_paths_only(self):
+        loc = filoc_json(self.path_fmt, writable=True, cache_locpath=self.test_dir + '/cache_simid={simid:d}', cache_version_prop='size', meta='size')
+        loc.write_contents([{"simid": 1, "epid": 10, 'a': 100, 'size': None}, {"simid": 1, "epid": 20, 'a': 200, 'size': None}])
+        loc.read_contents()
+
+        loc.write_contents([{"simid": 1, "epid": 10, 'a': 333, 'size': None}])
+
+        # only the written path is read again, the other entry of the same cache file is still valid
+        read_paths = []
+        read_path = loc._read_path
+        def tracking_read(path, *args):
+            read_paths.append(path)
+            return read_path(path, *args)
+        loc._read_path = tracking_read
+        p = loc.read_contents()
+        self.assertEqual([333, 200], [r['a'] for r in p])
+        self.assertEqual([self.test_dir + '/simid=1/epid=10/hyperparameters.json'], read_paths)
+
+    def test_cache_flush_leaves_no_temporary_file(self):
+        wloc = FilocIO(self.path_fmt, writable=True)
+        with wloc.open({"simid": 1, "epid": 10}, "w") as f: json.dump({'a': 100}, f)
+
+        cache_dir = self.test_dir + '/cache'
+        # own serializer instance: the builtin one is shared by all filocs
+        loc = filoc_json(self.path_fmt, cache_locpath=cache_dir + '/cache_simid={simid:d}', cache_version_prop='mtime', meta='mtime',
+                         cache_serializer=PickleCacheSerializer())
+        # the temporary file is not listed by the cache glob: the cache is written to a temporary file, then renamed
+        self.assertFalse(loc._cache_loc._matches_glob_path(cache_dir + '/.cache_simid=1.tmp.0123'))
+        loc.read_contents()
+        self.assertEqual(['cache_simid=1'], os.listdir(cache_dir))
+
+        # a failed flush removes its temporary file
+        def failing_dump(*args):
+            raise IOError('dump failed')
+        loc._cache_serializer.dump = failing_dump
+        loc.invalidate_cache()
+        with self.assertRaises(IOError):
+            loc.read_contents()
+        self.assertEqual([], os.listdir(cache_dir))
+
+    def test_cache_flush_writes_directly_when_temporary_file_would_be_listed(self):
+        wloc = FilocIO(self.path_fmt, writable=True)
+        with wloc.open({"simid": 1, "epid": 10}, "w") as f: json.dump({'a': 100}, f)
+
+        cache_dir = self.test_dir + '/cache'
+        loc = filoc_json(self.path_fmt, cache_locpath=cache_dir + '/{simid:d}', cache_version_prop='mtime', meta='mtime')
+        self.assertTrue(loc._cache_loc._matches_glob_path(cache_dir + '/.1.tmp.0123'))
+        loc.read_contents()
+        self.assertEqual(['1'], os.listdir(cache_dir))
+
     def test_write_contents(self):
         wloc = filoc_json(self.path_fmt, writable=True)
         wloc._write_props_list([
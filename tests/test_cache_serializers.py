@@ -0,0 +1,114 @@
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from filoc import filoc_json
+from filoc.cache_serializers import PickleCacheSerializer, MsgpackCacheSerializer
+
+
+# noinspection PyMissingOrEmptyDocstring
+class TestCacheSerializers(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.test_dir = tempfile.mkdtemp().replace('\\', '/')
+        self.path_fmt = self.test_dir + r'/simid={simid:d}/data.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _assert_round_trip(self, serializer):
+        key = serializer.key({'simid': 1, 'epid': 10})
+        self.assertEqual(key, serializer.key({'epid': 10, 'simid': 1}))  # independent of the props order
+        cache = {key: {'version': 123.4, 'props_list': [{'a': 100, 'simid': 1, 'epid': 10}]}}
+
+        f = io.BytesIO()
+        serializer.dump(cache, f)
+        f.seek(0)
+        self.assertEqual(serializer.load(f), cache)
+
+    def test_pickle_round_trip(self):
+        self._assert_round_trip(PickleCacheSerializer())
+
+    def test_msgpack_round_trip(self):
+        self._assert_round_trip(MsgpackCacheSerializer())
+
+    def test_builtin_cache_serializers(self):
+        loc1 = filoc_json(self.path_fmt, cache_locpath=self.test_dir + '/.cache1', cache_serializer='msgpack')
+        loc2 = filoc_json(self.path_fmt, cache_locpath=self.test_dir + '/.cache2', cache_serializer='msgpack')
+        self.assertIsInstance(loc1._cache_serializer, MsgpackCacheSerializer)
+        self.assertIs(loc1._cache_serializer, loc2._cache_serializer)
+        with self.assertRaises(ValueError):
+            filoc_json(self.path_fmt, cache_locpath=self.test_dir + '/.cache', cache_serializer='unknown')
+
+    def test_import_filoc_does_not_import_msgpack(self):
+        code = "import sys, filoc; sys.exit('msgpack' in sys.modules)"
+        self.assertEqual(0, subprocess.run([sys.executable, '-c', code]).returncode)
+
+    def test_msgpack_key_depends_on_value_types(self):
+        serializer = MsgpackCacheSerializer()
+        keys = [serializer.key({'a': v}) for v in (1, 1.0, True, 1, 1.0, True)]
+        self.assertEqual(keys[:3], keys[3:])
+        self.assertEqual(3, len(set(keys)))
+
+    def test_read_contents_with_msgpack_cache(self):
+        wloc = filoc_json(self.path_fmt, writable=True)
+        wloc.write_contents([{'simid': 1, 'a': 100}, {'simid': 2, 'a': 200}])
+
+        loc = filoc_json(self.path_fmt, cache_locpath=self.test_dir + '/.cache', cache_serializer='msgpack', cache_version_prop='mtime', meta='mtime')
+        for _ in range(2):
+            p = loc.read_contents()
+            self.assertEqual([{'a': 100, 'simid': 1}, {'a': 200, 'simid': 2}], [{'a': r['a'], 'simid': r['simid']} for r in p])
+
+    def test_msgpack_round_trip_naive_datetimes_and_tuples(self):
+        serializer = MsgpackCacheSerializer()
+        cache = {'k': {'version': 1.5, 'props_list': [{
+            'naive' : datetime(2020, 1, 2, 3, 4, 5),
+            'aware' : datetime(2020, 1, 2, tzinfo=timezone.utc),
+            'tuple' : (1, (2, 'x')),
+            'list'  : [1, 2],
+        }]}}
+        f = io.BytesIO()
+        serializer.dump(cache, f)
+        f.seek(0)
+        self.assertEqual(serializer.load(f), cache)
+
+    def test_msgpack_round_trip_dates_decimals_and_numpy_scalars(self):
+        import numpy as np
+        serializer = MsgpackCacheSerializer()
+        props = {'date': date(2020, 1, 2), 'decimal': Decimal('1.10'), 'int64': np.int64(3), 'bool_': np.bool_(True), 'float64': np.float64(1.5)}
+        f = io.BytesIO()
+        serializer.dump({'k': {'version': 1, 'props_list': [props]}}, f)
+        f.seek(0)
+        loaded_props = serializer.load(f)['k']['props_list'][0]
+        self.assertEqual(props, loaded_props)
+        self.assertEqual([date, Decimal, int, bool, float], [type(v) for v in loaded_props.values()])
+        self.assertEqual('1.10', str(loaded_props['decimal']))
+
+    def test_msgpack_dump_unsupported_value(self):
+        with self.assertRaises(TypeError):
+            MsgpackCacheSerializer().dump({'k': {'version': 1, 'props_list': [{'a': object()}]}}, io.BytesIO())
+
+    def test_msgpack_load_undecodable_cache_as_empty(self):
+        f = io.BytesIO()
+        PickleCacheSerializer().dump({PickleCacheSerializer().key({'simid': 1}): {'version': 1, 'props_list': []}}, f)
+        f.seek(0)
+        self.assertEqual(MsgpackCacheSerializer().load(f), {})
+
+    def test_read_contents_with_msgpack_cache_and_datetime_placeholder(self):
+        path_fmt = self.test_dir + r'/date={date:%Y-%m-%d}/data.json'
+        wloc = filoc_json(path_fmt, writable=True)
+        wloc.write_contents([{'date': datetime(2020, 1, 1), 'a': 100}, {'date': datetime(2020, 1, 2), 'a': 200}])
+
+        loc = filoc_json(path_fmt, cache_locpath=self.test_dir + '/.cache', cache_serializer='msgpack', cache_version_prop='mtime', meta='mtime')
+        for _ in range(2):
+            p = loc.read_contents()
+            self.assertEqual([{'a': 100, 'date': datetime(2020, 1, 1)}, {'a': 200, 'date': datetime(2020, 1, 2)}], [{'a': r['a'], 'date': r['date']} for r in p])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -94,6 +94,47 @@ class TestFilocConcurrency(unittest.TestCase):
             wait_state_and_increment(3)  # state 3 --> 4 (trigger lock release)
             wait_state_and_increment(5)  # state 5 --> 6 (lock released)
 
+    def test_lock_deletes_lost_attempt_before_next_check(self):
+        # the lock file of a lost attempt is deleted before the next ownership check,
+        # even though the winner releases the lock in between
+        loc = self.loc
+        winner_lock_file = self.test_dir + '/.lock_winner'
+
+        deleted_lock_files = []
+        delete_lock_file = loc._delete_lock_file
+
+        def recording_delete_lock_file(lock_file):
+            delete_lock_file(lock_file)
+            deleted_lock_files.append(lock_file)
+            self.assertFalse(os.path.exists(lock_file))
+
+        get_owning_lock_date_and_file = loc._get_owning_lock_date_and_file
+        call_count = 0
+
+        def scripted_get_owning_lock_date_and_file():
+            nonlocal call_count
+            call_count += 1
+            if call_count == 3:
+                self.assertEqual(len(deleted_lock_files), 1)  # lost attempt already cleaned up
+                os.remove(winner_lock_file)  # the winner releases the lock
+            result = get_owning_lock_date_and_file()
+            if call_count == 1:
+                # a concurrent contender writes an older lock file, just after our first check
+                with open(winner_lock_file, 'w') as f:
+                    f.write('{}')
+                past = time.time() - 100
+                os.utime(winner_lock_file, (past, past))
+            return result
+
+        loc._delete_lock_file = recording_delete_lock_file
+        loc._get_owning_lock_date_and_file = scripted_get_owning_lock_date_and_file
+
+        with loc.lock(attempt_count=3, attempt_secs=0.01):
+            self.assertEqual(len(deleted_lock_files), 1)
+            self.assertTrue(os.path.exists(deleted_lock_files[0]))  # lock file written again, after the deletion
+        self.assertEqual(len(deleted_lock_files), 2)
+        self.assertFalse(os.path.exists(deleted_lock_files[0]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,7 +5,7 @@ import unittest
 from io import UnsupportedOperation
 from pathlib import Path
 
-from filoc.filoc_io import FilocIO
+from filoc.filoc_io import FilocIO, sort_natural, mix_dicts_and_coerce, flatten_meta
 
 
 def touch_file(file_path):
@@ -24,6 +24,18 @@ class TestFilocIO(unittest.TestCase):
     def tearDown(self):
         shutil.rmtree(self.test_dir)
 
+    def test_sort_natural(self):
+        self.assertListEqual(sort_natural(['a10', 'a2', 'b', 'a2x3', 'x\u00b21']), ['a2', 'a2x3', 'a10', 'b', 'x\u00b21'])
+
+    def test_mix_dicts_and_coerce(self):
+        self.assertEqual(mix_dicts_and_coerce({'a': 1, 'b': 2}, {'b': 3}), {'a': 1, 'b': 3})
+        self.assertEqual(mix_dicts_and_coerce({'a': 1}, None), {'a': 1})
+        self.assertEqual(mix_dicts_and_coerce(None, {}), {})
+
+    def test_flatten_meta(self):
+        meta = {'a': {'x': 1, 'y': {'z': 2.5}, 'e': {}}, 'l': [1, {'q': 1}], 'n': None}
+        self.assertEqual(list(flatten_meta(meta).items()), [('l', [1, {'q': 1}]), ('n', None), ('a.x', 1), ('a.y.z', 2.5)])
+
     def test_get_path_properties(self):
         loc = FilocIO(self.path_fmt)
         props = loc.parse_path_properties(rf"{self.test_dir}/simid=12/epid=102/hyperparameters.json")
@@ -37,16 +49,46 @@ class TestFilocIO(unittest.TestCase):
         self.assertEqual(len(props), 1)
         self.assertEqual(props['v'], '')
 
+    def test_get_path_properties_memoized_result_is_not_shared(self):
+        loc = FilocIO(self.path_fmt)
+        path = rf"{self.test_dir}/simid=12/epid=102/hyperparameters.json"
+        props = loc.parse_path_properties(path)
+        props['simid'] = 13
+        self.assertEqual(loc.parse_path_properties(path)['simid'], 12)
+
     def test_get_path(self):
         loc = FilocIO(self.path_fmt)
         path1 = loc.render_path(simid=12, epid=102)
         self.assertEqual(path1, rf"{self.test_dir}/simid=12/epid=102/hyperparameters.json")
         # Todo: test other formattings: float, string
 
+    def test_get_path_with_format_spec(self):
+        loc = FilocIO(f'{self.test_dir}/run={{run:03d}}/x={{x:.2f}}/{{name}}.json')
+        path1 = loc.render_path(run=7, x=0.5, name='a')
+        self.assertEqual(path1, rf"{self.test_dir}/run=007/x=0.50/a.json")
+
+    def test_get_path_memoization_distinguishes_value_types(self):
+        loc = FilocIO(f'{self.test_dir}/a={{a}}/b={{b:d}}.json')
+        self.assertEqual(loc.render_path(a=1, b=2), rf"{self.test_dir}/a=1/b=2.json")
+        self.assertEqual(loc.render_path(a=1.0, b=2), rf"{self.test_dir}/a=1.0/b=2.json")
+        self.assertEqual(loc.render_path(a=True, b=2), rf"{self.test_dir}/a=True/b=2.json")
+        with self.assertRaises(ValueError):
+            loc.render_path(a=1, b=2.0)
+
+    def test_get_path_constant_locpath(self):
+        loc = FilocIO(f'{self.test_dir}/config.json')
+        self.assertEqual(loc.render_path(), rf"{self.test_dir}/config.json")
+        self.assertEqual(loc.render_glob_path(x=1), rf"{self.test_dir}/config.json")
+        self.assertEqual(loc.parse_path_properties(rf"{self.test_dir}/config.json"), {})
+
     def test_get_glob_path(self):
         loc = FilocIO(self.path_fmt)
         path1 = loc.render_glob_path(epid=102)
         self.assertEqual(path1, rf"{self.test_dir}/simid=*/epid=102/hyperparameters.json")
+        path2 = loc.render_glob_path(simid=12, epid=102)
+        self.assertEqual(path2, rf"{self.test_dir}/simid=12/epid=102/hyperparameters.json")
+        path3 = loc.render_glob_path()
+        self.assertEqual(path3, rf"{self.test_dir}/simid=*/epid=*/hyperparameters.json")
         # Todo: test other formattings: float, string
 
     def test_find_paths(self):
@@ -123,6 +165,38 @@ class TestFilocIO(unittest.TestCase):
         p = loc.list_paths_and_props_and_meta(epid=12)
         self.assertListEqual(p, [])
 
+    def test_list_paths_walks_constant_folders(self):
+        loc = FilocIO(self.test_dir + r'/simid={simid:d}/config/epid={epid:d}/hyperparameters.json')
+        touch_file(loc.render_path(simid=1, epid=10))
+        touch_file(loc.render_path(simid=2, epid=10))
+        touch_file(rf"{self.test_dir}/simid=2/other/epid=10/hyperparameters.json")
+        touch_file(rf"{self.test_dir}/simid=3/config/epid=10/other.json")
+        Path(rf"{self.test_dir}/simid=4").touch()
+        expected = loc.fs.glob(loc.render_glob_path())
+        p = loc.list_paths()
+        self.assertListEqual(p, [
+            rf"{self.test_dir}/simid=1/config/epid=10/hyperparameters.json",
+            rf"{self.test_dir}/simid=2/config/epid=10/hyperparameters.json",
+        ])
+        self.assertListEqual(sorted(p), sorted(expected))
+        loc_concurrent = FilocIO(self.test_dir + r'/simid={simid:d}/config/epid={epid:d}/hyperparameters.json', max_list_workers=4)
+        self.assertListEqual(loc_concurrent.list_paths(), p)
+
+    def test_list_paths_and_props_and_detail_fully_constrained(self):
+        loc = FilocIO(self.path_fmt)
+        touch_file(loc.render_path(simid=1, epid=10))
+        touch_file(loc.render_path(simid=1, epid=20))
+
+        p = loc.list_paths_and_props_and_meta(simid=1, epid=20)
+        p0and1 = [ (i[0], i[1]) for i in p ]
+        self.assertListEqual(p0and1, [
+            (rf"{self.test_dir}/simid=1/epid=20/hyperparameters.json", {'simid': 1, 'epid': 20}),
+        ])
+        self.assertIn('size', p[0][2])
+
+        p = loc.list_paths_and_props_and_meta(simid=2, epid=10)
+        self.assertListEqual(p, [])
+
     def test_exists(self):
         loc = FilocIO(self.path_fmt)
         self.assertEqual(loc.exists(simid=1, epid=10), False)
@@ -156,6 +230,14 @@ class TestFilocIO(unittest.TestCase):
         loc.delete(dict(simid=1, epid=10))
         self.assertEqual(loc.exists(simid=1, epid=10), False)
 
+    def test_delete_folders(self):
+        loc = FilocIO(self.test_dir + r'/simid={simid:d}', writable=True)
+        touch_file(self.test_dir + '/simid=1/epid=10/hyperparameters.json')
+        touch_file(self.test_dir + '/simid=2/epid=10/hyperparameters.json')
+        loc.delete(dict(simid=1))
+        self.assertEqual(loc.exists(simid=1), False)
+        self.assertEqual(loc.exists(simid=2), True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -18,3 +18,7 @@ class TestFmtParser(unittest.TestCase):
         expected_output = {"date": datetime.strptime(input_str, "%Y-%m-%d/%H:%M:%S")}
         self.assertEqual(parser.parse(input_str), expected_output)
 
+    def test_parse_float_followed_by_int(self):
+        parser = FmtParser("a={x:g}/b={y:d}")
+        self.assertEqual(parser.parse("a=1.5e3/b=4"), {"x": 1500.0, "y": 4})
+        self.assertEqual(parser.parse("a=1.5/b=4"), {"x": 1.5, "y": 4})
@@ -38,3 +38,15 @@ class TestUtils(unittest.TestCase):
     def test__combine_list_ok_ok(self):
         r = utils._combine_list([1, 2], [3, 4])
         self.assertEqual([1, 2, 3, 4], r)
+
+    def test_merge_tables_matches_rows_missing_a_join_key(self):
+        table_by_name = {
+            'a': [{'x': 1, 'y': 1, 'v': 'a11'}, {'x': 2, 'y': 1, 'v': 'a21'}],
+            'b': [{'x': 1, 'y': 1, 'w': 'b11'}, {'y': 1, 'w': 'b_1'}],
+        }
+        r = utils.merge_tables(table_by_name, ['x', 'y'], '.', 'index')
+        self.assertEqual([
+            {'index.x': 1, 'index.y': 1, 'a.v': 'a11', 'b.w': 'b11'},
+            {'index.x': 1, 'index.y': 1, 'a.v': 'a11', 'b.w': 'b_1'},
+            {'index.x': 2, 'index.y': 1, 'a.v': 'a21', 'b.w': 'b_1'},
+        ], r)